@@ -0,0 +1,47 @@
+"""
+Benchmark of headless games with and without printing of game events.
+
+Run from the repository root with: python -m Benchmarks.benchmark_headless
+"""
+import contextlib
+import os
+import time
+from typing import Tuple
+
+import numpy as np
+
+from game import Game
+from headless_interactions import HeadlessInteractionHandler
+from random_player import RandomPlayer
+
+
+def run_games(n_games: int, verbose: bool) -> Tuple[float, float]:
+    """
+    :param n_games: number of games to play
+    :param verbose: whether the games print their events
+    :return: mean start time of a game in ms and ticks per second
+    """
+    board = np.zeros((20, 20), dtype=int)
+    player = RandomPlayer()
+    start_time = 0.0
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for seed in range(n_games):
+            game_start = time.perf_counter()
+            game = Game(board, random_seed=seed, verbose=verbose)
+            handler = HeadlessInteractionHandler(player)
+            start_time += time.perf_counter() - game_start
+            game.run_game(handler)
+    duration = time.perf_counter() - start
+    return start_time / n_games * 1e3, player.ticks / duration
+
+
+def main():
+    n_games = 2000
+    for verbose in (True, False):
+        start_ms, ticks_per_second = run_games(n_games, verbose)
+        print(f'verbose={verbose!s:<5}  game start: {start_ms:.3f} ms  ticks/sec: {ticks_per_second:,.0f}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark of Snake.update for different snake lengths.
+
+Run from the repository root with: python -m Benchmarks.benchmark_snake
+"""
+import timeit
+from typing import List, Tuple
+
+from snake import Snake
+
+
+class ListSnake(Snake):
+    """
+    Former list based implementation of Snake.update, kept as reference for the benchmark.
+    """
+
+    def __init__(self, body: List[Tuple[int, int]]):
+        super().__init__(body)
+        self.list_body = list(body)
+
+    def update(self, got_food: bool = False) -> bool:
+        new_head = self.get_propagated_head()
+        self.list_body = self.list_body + [new_head]
+        if not got_food:
+            del self.list_body[0]
+        return new_head not in self.list_body[:-1]
+
+    def get_propagated_head(self) -> Tuple[int, int]:
+        head = self.list_body[-1]
+        return head[0] + self.moving_direction[0], head[1] + self.moving_direction[1]
+
+
+def time_update(snake_class: type, length: int, number: int) -> float:
+    """
+    :param snake_class: class of the snake to benchmark
+    :param length: length of the snake
+    :param number: number of updates
+    :return: mean duration of one update in µs
+    """
+    snake = snake_class([(0, i) for i in range(length)])
+    snake.change_moving_direction((0, 1))
+    return timeit.timeit(snake.update, number=number) / number * 1e6
+
+
+def main():
+    number = 20000
+    print(f'{"length":>8} {"list [µs]":>12} {"deque [µs]":>12} {"speedup":>8}')
+    for length in (10, 100, 1000):
+        list_time = time_update(ListSnake, length, number)
+        deque_time = time_update(Snake, length, number)
+        print(f'{length:>8} {list_time:>12.3f} {deque_time:>12.3f} {list_time / deque_time:>8.1f}')
+
+
+if __name__ == "__main__":
+    main()
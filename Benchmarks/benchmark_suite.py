@@ -0,0 +1,318 @@
+"""
+Benchmark suite of the game engine with JSON output and a comparison of two runs.
+
+Run from the repository root with:
+    python -m Benchmarks.benchmark_suite run --output benchmark.json [--quick] [--only game_ticks ...]
+    python -m Benchmarks.benchmark_suite compare baseline.json benchmark.json [--tolerance 0.1]
+The comparison exits with status 1 if a benchmark regressed by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from board import Board, load_level
+from game import Game
+from headless_interactions import HeadlessInteractionHandler
+from interaction_handler import default_encoding
+from random_player import RandomPlayer
+from search_player import SearchPlayer
+from snake import Snake
+
+SEED = 0
+LEVELS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'levels')
+Result = Dict[str, object]
+
+
+def best_time(function: Callable[[], None], repeat: int) -> float:
+    """
+    :param function: function to time
+    :param repeat: number of runs
+    :return: shortest duration of a run in s; the minimum is the least disturbed by other processes
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def result(value: float, unit: str, higher_is_better: bool) -> Result:
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def benchmark_game_ticks(quick: bool) -> Dict[str, Result]:
+    """
+    Ticks per second of complete games with a random player, through run_game and through step.
+    """
+    n_games = 100 if quick else 1000
+    board = np.zeros((20, 20), dtype=int)
+    results = {}
+
+    def run_games():
+        player.random.seed(SEED)
+        player.ticks = 0
+        for seed in range(n_games):
+            Game(board, random_seed=SEED + seed, verbose=False).run_game(HeadlessInteractionHandler(player))
+
+    player = RandomPlayer(SEED)
+    duration = best_time(run_games, 3)
+    results['game_ticks[run_game]'] = result(player.ticks / duration, 'ticks/s', True)
+
+    moves = [(-1, 0), (0, -1), (1, 0), (0, 1)]
+    ticks = 0
+
+    def step_games():
+        nonlocal ticks
+        ticks = 0
+        random_generator = random.Random(SEED)
+        for seed in range(n_games):
+            game = Game(board, random_seed=SEED + seed, verbose=False)
+            game.reset()
+            done = False
+            while not done:
+                _, _, done, _ = game.step(random_generator.choice(moves))
+                ticks += 1
+
+    duration = best_time(step_games, 3)
+    results['game_ticks[step]'] = result(ticks / duration, 'ticks/s', True)
+    return results
+
+
+def benchmark_snake_update(quick: bool) -> Dict[str, Result]:
+    """
+    Duration of Snake.update for growing snake lengths; should be independent of the length.
+    """
+    number = 2000 if quick else 20000
+    results = {}
+    for length in (10, 100, 1000, 10000):
+        snake = Snake([(0, i) for i in range(length)])
+        snake.change_moving_direction((0, 1))
+
+        def updates():
+            for _ in range(number):
+                snake.update()
+
+        results[f'snake_update[length={length}]'] = result(best_time(updates, 5) / number * 1e6, 'µs', False)
+    return results
+
+
+def benchmark_seed_element(quick: bool) -> Dict[str, Result]:
+    """
+    Duration of drawing a free field on a 50 x 50 board for growing ratios of occupied fields.
+    """
+    number = 2000 if quick else 20000
+    results = {}
+    for fill_ratio in (0.1, 0.5, 0.9, 0.99):
+        game = Game(np.zeros((50, 50), dtype=int), random_seed=SEED, verbose=False)
+        fields = list(game.free_fields.fields)
+        random.Random(SEED).shuffle(fields)
+        for field in fields[:int(fill_ratio * 2500) - 2]:
+            game.free_fields.discard(field)
+
+        def draws():
+            for _ in range(number):
+                game.free_fields.add(game.seed_element())
+
+        results[f'seed_element[fill={fill_ratio}]'] = result(best_time(draws, 5) / number * 1e6, 'µs', False)
+    return results
+
+
+def benchmark_occupying_matrix(quick: bool) -> Dict[str, Result]:
+    """
+    Duration of building the occupying matrix and of getting it on a tick for growing board sizes.
+    """
+    number = 20 if quick else 200
+    results = {}
+    handler = HeadlessInteractionHandler(RandomPlayer(SEED))
+    for size in (10, 50, 100, 200):
+        game = Game(np.zeros((size, size), dtype=int), random_seed=SEED, verbose=False)
+        game.snake.body = [(2, column) for column in range(2, size // 2 + 2)]
+
+        def builds():
+            for _ in range(number):
+                game.occupying_matrix = None
+                game.get_occupying_matrix(handler)
+
+        def gets():
+            for _ in range(number * 100):
+                game.get_occupying_matrix(handler)
+
+        results[f'occupying_matrix_build[size={size}]'] = result(best_time(builds, 5) / number * 1e6, 'µs', False)
+        results[f'occupying_matrix_get[size={size}]'] = result(best_time(gets, 5) / number / 100 * 1e6, 'µs',
+                                                                False)
+    return results
+
+
+def benchmark_training(quick: bool) -> Dict[str, Result]:
+    """
+    Games and ticks per second of headless training as in main_with_AI.
+    """
+    import torch
+    from pytorch_player import PyTorchPlayer
+
+    n_games = 5 if quick else 30
+    random.seed(SEED)
+    torch.manual_seed(SEED)
+    board = np.zeros((20, 25), dtype=int)
+    player = PyTorchPlayer(plot=False)
+    player.memory.random = np.random.default_rng(SEED)
+    ticks = 0
+
+    start = time.perf_counter()
+    for seed in range(n_games):
+        game = Game(board, random_seed=SEED + seed, verbose=False)
+        handler = HeadlessInteractionHandler(player, default_encoding)
+        player.encoding = handler.get_encoding_dict()
+        player.new_round()
+        game.run_game(handler)
+        player.closing_action(game.game_score)
+        ticks += player.counter_move
+    duration = time.perf_counter() - start
+    return {'training[games]': result(n_games / duration, 'games/s', True),
+            'training[ticks]': result(ticks / duration, 'ticks/s', True)}
+
+
+def benchmark_search_player(quick: bool) -> Dict[str, Result]:
+    """
+    Duration of the moves of the search player (get_response, including its path planning) on empty boards, which
+    have a Hamiltonian cycle, and on walled boards without one; besides the mean, the 99th percentile and the maximum
+    show the ticks in which the player searches. On walled boards the maximum also includes the flood fills that check
+    that the snake does not trap itself, which are not bounded by the search budget.
+    """
+    n_ticks = 2000 if quick else 20000
+    walled = np.zeros((100, 100), dtype=int)
+    walled[50] = 1
+    walled[50, 37] = 0
+    boards = {f'empty{size}': Board(np.zeros((size, size), dtype=int)) for size in (20, 50, 100)}
+    boards['rooms'] = load_level(os.path.join(LEVELS, 'rooms.txt'))
+    boards['wall100'] = Board(walled)
+
+    results = {}
+    for name, board in boards.items():
+        player = SearchPlayer(board)
+        game = Game(board, random_seed=SEED, verbose=False)
+        observation = game.reset()
+        durations = np.empty(n_ticks)
+        for tick in range(n_ticks):
+            player.push_board_status(observation, game.snake.get_moving_direction(), game.game_score,
+                                     game.food.get_score())
+            start = time.perf_counter()
+            action = player.get_response()
+            durations[tick] = time.perf_counter() - start
+            observation, _, done, _ = game.step(action)
+            if done or len(game.snake) >= player.n_fields - 1:
+                observation = game.reset()
+
+        durations *= 1e6
+        results[f'search_player[board={name},mean]'] = result(float(durations.mean()), 'µs', False)
+        results[f'search_player[board={name},p99]'] = result(float(np.percentile(durations, 99)), 'µs', False)
+        results[f'search_player[board={name},max]'] = result(float(durations.max()), 'µs', False)
+    return results
+
+
+BENCHMARKS = {
+    'game_ticks': benchmark_game_ticks,
+    'snake_update': benchmark_snake_update,
+    'seed_element': benchmark_seed_element,
+    'occupying_matrix': benchmark_occupying_matrix,
+    'search_player': benchmark_search_player,
+    'training': benchmark_training,
+}
+
+
+def metadata(quick: bool) -> dict:
+    """
+    :return: description of the run for the JSON output
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0],
+            'numpy': np.__version__, 'platform': platform.platform(), 'seed': SEED, 'quick': quick}
+
+
+def run(names: List[str], quick: bool) -> dict:
+    """
+    :param names: names of the benchmarks to run
+    :param quick: if True, fewer repetitions are run
+    :return: metadata and results of the benchmarks
+    """
+    results = {}
+    for name in names:
+        for key, value in BENCHMARKS[name](quick).items():
+            results[key] = value
+            print(f'{key:<40} {value["value"]:>14,.3f} {value["unit"]}')
+    return {'metadata': metadata(quick), 'results': results}
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> List[Tuple[str, float]]:
+    """
+    Prints the relative change of each benchmark that is contained in both runs; positive changes are improvements.
+
+    :param baseline: output of the reference run
+    :param current: output of the new run
+    :param tolerance: relative slowdown that is not reported as regression
+    :return: names and relative slowdowns of the regressed benchmarks
+    """
+    regressions = []
+    print(f'{"benchmark":<40} {"baseline":>14} {"current":>14} {"change":>8}')
+    for name, base in baseline['results'].items():
+        if name not in current['results']:
+            continue
+        value = current['results'][name]['value']
+        # slowdown > 0 means worse, independent of whether higher or lower values are better
+        if base['higher_is_better']:
+            slowdown = base['value'] / value - 1
+        else:
+            slowdown = value / base['value'] - 1
+        flag = ''
+        if slowdown > tolerance:
+            regressions.append((name, slowdown))
+            flag = '  REGRESSION'
+        print(f'{name:<40} {base["value"]:>14,.3f} {value:>14,.3f} {-slowdown:>+8.1%}{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the game engine.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--output', default=None, help='JSON file the results are written to')
+    run_parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                            help='benchmarks to run')
+    run_parser.add_argument('--quick', action='store_true', help='fewer repetitions, e.g. for a smoke test')
+    compare_parser = commands.add_parser('compare', help='compare two runs')
+    compare_parser.add_argument('baseline', help='JSON file of the reference run')
+    compare_parser.add_argument('current', help='JSON file of the new run')
+    compare_parser.add_argument('--tolerance', type=float, default=0.1, help='relative slowdown that is accepted')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        output = run(args.only, args.quick)
+        if args.output is not None:
+            with open(args.output, 'w') as file:
+                json.dump(output, file, indent=2)
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        regressions = compare(baseline, current, args.tolerance)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}.')
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark of the number of games needed to reach a score threshold with and without target network.
+
+Run from the repository root with: python -m Benchmarks.benchmark_target_network
+"""
+import random
+from typing import Optional
+
+import numpy as np
+import torch
+
+from game import Game
+from headless_interactions import HeadlessInteractionHandler
+from pytorch_player import PyTorchPlayer
+
+CONFIGURATIONS = {
+    'current': {},
+    'target (hard, 100)': {'target_update': 100},
+    'target (soft, 0.01)': {'tau': 0.01},
+    'double dqn (hard, 100)': {'target_update': 100, 'double_dqn': True},
+}
+
+
+def games_to_threshold(seed: int, threshold: float, window: int, max_games: int, **player_options) -> Optional[int]:
+    """
+    :param seed: seed of games, exploration and network initialization
+    :param threshold: mean score over the last window games that has to be reached
+    :param window: number of games the mean score is taken over
+    :param max_games: maximal number of games
+    :param player_options: keyword arguments of PyTorchPlayer
+    :return: number of games until the threshold was reached or None if it was not reached within max_games
+    """
+    random.seed(seed)
+    torch.manual_seed(seed)
+    board = np.zeros((10, 10), dtype=int)
+    player = PyTorchPlayer(plot=False, **player_options)
+    player.memory.random = np.random.default_rng(seed)
+    scores = []
+    for game_index in range(max_games):
+        game = Game(board, random_seed=seed * max_games + game_index, verbose=False)
+        interacter = HeadlessInteractionHandler(player)
+        player.encoding = interacter.get_encoding_dict()
+        player.new_round()
+        game.run_game(interacter)
+        player.closing_action(game.game_score)
+        scores.append(game.game_score)
+        if len(scores) >= window and np.mean(scores[-window:]) >= threshold:
+            return game_index + 1
+    return None
+
+
+def main():
+    seeds = range(3)
+    threshold, window, max_games = 30, 20, 400
+    print(f'games until the mean score of {window} games reaches {threshold} (max. {max_games})')
+    for name, options in CONFIGURATIONS.items():
+        results = [games_to_threshold(seed, threshold, window, max_games, **options) for seed in seeds]
+        print(f'{name:<24}', '  '.join('-' if result is None else f'{result:>4}' for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import numpy as np
+
+from batch_game import BatchGame
+
+
+def test_batch_game_eat_and_wall_collision():
+    """
+    Tests that all snakes of a batch eat, grow and crash into the wall like in class Game.
+
+    :return:
+    """
+    board = np.zeros((5, 5), dtype=int)
+    batch = BatchGame(board, n_games=3, snake_start=(3, 3), food_start=(3, 4))
+    right = np.tile((0, 1), (3, 1))
+
+    reward, done = batch.step(right)
+    assert np.all(reward == 10) and not np.any(done)
+    assert all(batch.get_body(game) == [(3, 3), (3, 4)] for game in range(3))
+    assert np.all(batch.game_score == 10)
+
+    for _ in range(3):
+        reward, done = batch.step(right)
+    assert np.all(done) and np.all(batch.final_score == 10)
+    assert all(batch.get_body(game) == [(3, 3)] for game in range(3))  # games are reset
+
+
+def test_batch_game_reversal_and_self_collision():
+    """
+    Tests that reversed directions are ignored and that crashing into the own body ends the game.
+
+    :return:
+    """
+    board = np.zeros((5, 5), dtype=int)
+    batch = BatchGame(board, n_games=1, snake_start=(2, 2), food_start=(2, 3))
+    batch.step([(0, 1)])
+    batch.food_position[0] = (2, 4)
+    batch.step([(0, 1)])
+    batch.food_position[0] = (3, 4)
+    batch.step([(1, 0)])
+    batch.food_position[0] = (6, 6)
+    assert batch.get_body(0) == [(2, 2), (2, 3), (2, 4), (3, 4)]
+
+    _, done = batch.step([(-1, 0)])  # reversal is ignored
+    assert not done[0] and batch.get_body(0)[-1] == (4, 4)
+
+    batch.food_position[0] = (4, 3)
+    batch.step([(0, -1)])
+    batch.food_position[0] = (6, 6)
+    batch.step([(-1, 0)])
+    _, done = batch.step([(0, 1)])
+    assert done[0] and batch.final_score[0] == 40
+
+
+def test_batch_game_occupying_matrix():
+    """
+    Tests that the encoded boards of a batch match Game.get_occupying_matrix.
+
+    :return:
+    """
+    from game import Game
+
+    symbols = {'head': 101, 'wall': 1, 'valid': 0, 'snake': 100, 'food': 200}
+    board = np.zeros((4, 6), dtype=int)
+    batch = BatchGame(board, n_games=2, snake_start=(2, 2), food_start=(2, 3))
+    batch.step([(0, 1), (0, 1)])
+    batch.food_position[:] = (4, 5)
+
+    game = Game(board, snake_start=(2, 2), food_start=(4, 5))
+    game.snake.body = [(2, 2), (2, 3)]
+
+    class Handler:
+        def get_encoding_dict(self):
+            return symbols
+
+    expected = game.get_occupying_matrix(Handler())
+    matrices = batch.get_occupying_matrix(symbols)
+    assert np.array_equal(matrices[0], expected) and np.array_equal(matrices[1], expected)
@@ -0,0 +1,78 @@
+import numpy as np
+
+from actions import ACTION_DTYPE, N_ACTIONS
+from batch_training import train_batched
+from pytorch_player import PyTorchPlayer
+from state_features import N_FEATURES
+
+
+def record_batch_sizes(player: PyTorchPlayer) -> list:
+    """
+    :param player: player whose minibatches are recorded
+    :return: list the size of each sampled minibatch is appended to
+    """
+    batch_sizes = []
+    sample_indices = player.memory.sample_indices
+
+    def recording_sample_indices(batch_size):
+        batch_sizes.append(batch_size)
+        return sample_indices(batch_size)
+
+    player.memory.sample_indices = recording_sample_indices
+    return batch_sizes
+
+
+def test_count_step():
+    """
+    Tests that the player trains on a minibatch of batch_size transitions every train_interval moves.
+
+    :return:
+    """
+    player = PyTorchPlayer(plot=False, train_interval=16, batch_size=8)
+    n = 20
+    rng = np.random.default_rng(0)
+    player.memory.extend(rng.integers(0, 2, (n, N_FEATURES)), rng.integers(0, N_ACTIONS, n), rng.normal(size=n),
+                         rng.integers(0, 2, (n, N_FEATURES)), np.zeros(n, dtype=bool))
+    batch_sizes = record_batch_sizes(player)
+
+    player.count_step(10)
+    assert player.counter_updates == 0
+    player.count_step(10)
+    assert player.counter_updates == 1
+    player.count_step(40)
+    assert player.counter_steps == 60 and player.counter_updates == 3 and batch_sizes == [8, 8, 8]
+
+
+def test_train_batched():
+    """
+    Tests the minibatch schedule of the batched training: every tick adds one transition per game.
+
+    :return:
+    """
+    player = PyTorchPlayer(plot=False, train_interval=16, batch_size=8)
+    batch_sizes = record_batch_sizes(player)
+    train_batched(player, np.zeros((10, 10), dtype=int), n_games=4, n_ticks=20)
+
+    assert player.counter_steps == 80 and len(player.memory) == 80
+    assert player.counter_updates == 5 and batch_sizes == [8] * 5
+
+
+def test_act_batch():
+    """
+    Tests that the batched actions equal the greedy actions of the single states once the exploration ended.
+
+    :return:
+    """
+    player = PyTorchPlayer(plot=False)
+    rng = np.random.default_rng(1)
+    states = rng.integers(0, 2, (32, N_FEATURES)).astype(np.uint8)
+
+    player.counter_games = 0
+    actions = player.act_batch(states, rng)
+    assert actions.shape == (32,) and actions.dtype == ACTION_DTYPE and np.all((actions >= 0) & (actions < N_ACTIONS))
+
+    player.counter_games = 100
+    actions = player.act_batch(states, rng)
+    for state, action in zip(states, actions):
+        player.new_status = {'predictor_vector': state}
+        assert player.predict_action() == action
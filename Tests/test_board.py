@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from actions import DIRECTIONS, DOWN, LEFT, RIGHT, UP
+from batch_game import BatchGame
+from board import Board, edge_mask, load_level
+from game import Game
+
+
+def test_shared_board(tmp_path):
+    """
+    Tests that games share a given board, that it is read-only and that a memory-mapped board plays the same game.
+
+    :return:
+    """
+    layout = np.zeros((30, 40), dtype=int)
+    layout[10, 5:35] = 1
+    board = Board(layout)
+    assert board.board_matrix.dtype == np.uint8 and np.array_equal(board.layout, layout)
+    with pytest.raises(ValueError):
+        board.board_matrix[3, 3] = 1
+
+    games = [Game(board, random_seed=seed, verbose=False) for seed in range(3)]
+    assert all(game.board.board_matrix is board.board_matrix for game in games)
+    assert games[0].reset().dtype == np.uint8
+    assert BatchGame(board, 4).walls.shape == board.board_matrix.shape
+
+    path = str(tmp_path / 'board.npy')
+    board.save(path)
+    mapped = Board.load(path)
+    assert isinstance(mapped.board_matrix.base, np.memmap) or isinstance(mapped.board_matrix, np.memmap)
+
+    moves = [(0, 1)] * 3 + [(1, 0)] * 3 + [(0, -1)] * 3
+    observations = []
+    for shared_board in (board, mapped):
+        game = Game(shared_board, random_seed=7, verbose=False)
+        for move in moves:
+            observation, _, _, _ = game.step(move)
+        observations.append(np.copy(observation))
+    assert np.array_equal(observations[0], observations[1])
+
+
+def test_level(tmp_path):
+    """
+    Tests parsing and caching of a level file and the valid neighbour tables.
+
+    :return:
+    """
+    path = tmp_path / 'level.txt'
+    path.write_text('....\n.#..\n....\n')
+    board = load_level(str(path))
+    assert load_level(str(path)) is board
+    assert np.array_equal(board.layout, [[0, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0]])
+    assert np.all(board.board_matrix[edge_mask(board.board_matrix, 2)] == 1)
+
+    # field right of the inner wall (padded coordinates)
+    field = (3, 4)
+    assert [board.valid_neighbours[(action,) + field] for action in (UP, LEFT, DOWN, RIGHT)] == [True, False, True,
+                                                                                                 True]
+    rows, cols = np.nonzero(board.board_matrix[1:-1, 1:-1] < 2)
+    rows, cols = rows + 1, cols + 1
+    for action, (row_offset, col_offset) in enumerate(DIRECTIONS[:4]):
+        assert np.array_equal(board.valid_neighbours[action, rows, cols],
+                              board.board_matrix[rows + row_offset, cols + col_offset] == 0)
+    assert not board.valid_neighbours[UP, 0].any() and not board.valid_neighbours[RIGHT, :, -1].any()
+
+    with pytest.raises(ValueError):
+        Board.from_text('..\n.x\n')
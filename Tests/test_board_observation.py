@@ -0,0 +1,27 @@
+import numpy as np
+
+from board_observation import board_observation, observation_shape
+from game import Game
+from interaction_handler import default_encoding
+
+
+def test_board_observation_stacks_frames():
+    """
+    Tests the planes of the observation and that each tick shifts the frames by one.
+
+    :return:
+    """
+    game = Game(np.zeros((4, 5), dtype=int), snake_start=(3, 3), food_start=(3, 5), random_seed=1, verbose=False)
+    matrix = game.reset()
+    buffers = np.zeros((2,) + observation_shape(matrix.shape, n_frames=3), dtype=np.uint8)
+
+    first = board_observation(matrix, default_encoding, out=buffers[0])
+    assert np.shares_memory(first, buffers[0]) and first.shape == (10, 8, 9)
+    assert np.array_equal(first[0], game.board.board_matrix == 1)
+    assert first[-3, 3, 3] == 1 and first[-3].sum() == 1 and first[-1, 3, 5] == 1
+    assert np.array_equal(first[1:4], first[-3:])
+
+    matrix, _, _, _ = game.step((0, 1))
+    second = board_observation(matrix, default_encoding, previous=first, out=buffers[1])
+    assert np.array_equal(second[:-3], np.concatenate((first[:1], first[4:])))
+    assert second[-3, 3, 4] == 1 and second[-3].sum() == 1
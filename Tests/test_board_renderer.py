@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pygame
+
+from board_renderer import BoardRenderer, load_sprite, HEAD_PICTURE, FOOD_PICTURE
+from game import Game
+from interaction_handler import InteractionHandler
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+FORMATTING = {
+    'head': {'code': 101, 'color': (0, 0, 255), 'picture': None},
+    'wall': {'code': 1, 'color': (0, 0, 0), 'picture': None},
+    'valid': {'code': 0, 'color': (255, 255, 255), 'picture': None},
+    'snake': {'code': 100, 'color': (100, 100, 255), 'picture': None},
+    'food': {'code': 200, 'color': (255, 0, 0), 'picture': None}
+}
+
+
+class RecordingInteractions(InteractionHandler):
+    """
+    Plays a fixed sequence of moves and records copies of the pushed boards and scores.
+    """
+
+    def __init__(self, moves):
+        self.moves = list(moves)
+        self.frames = []
+
+    def get_encoding_dict(self):
+        return {kind: formatting['code'] for kind, formatting in FORMATTING.items()}
+
+    def push_board_status(self, geometry_matrix, moving_direction, current_score, food_score) -> None:
+        self.frames.append((np.copy(geometry_matrix), current_score, moving_direction))
+
+    def get_interaction(self):
+        return self.moves.pop(0) if self.moves else (0, 1)
+
+
+def test_dirty_rendering_matches_full_rendering(formatting=FORMATTING):
+    """
+    Tests that drawing only the changed blocks yields the same picture as drawing every frame from scratch.
+
+    :return:
+    """
+    pygame.init()
+    game = Game(np.zeros((6, 8), dtype=int), snake_start=(3, 3), food_start=(3, 4), random_seed=1, verbose=False)
+    handler = RecordingInteractions([(0, 1), (1, 0), (1, 0), (0, -1), (0, -1), (-1, 0), (-1, 0), (-1, 0)])
+    game.run_game(handler)
+
+    block_length = 10
+    size = (game.board.board_matrix.shape[1] * block_length, game.board.board_matrix.shape[0] * block_length)
+    display = pygame.display.set_mode(size)
+    font = pygame.font.SysFont('comicsansms', 15, bold=True)
+    renderer = BoardRenderer(display, block_length, formatting, font)
+    reference = pygame.Surface(size)
+
+    for matrix, score, moving_direction in handler.frames:
+        renderer.render(matrix, score, moving_direction)
+        BoardRenderer(reference, block_length, formatting, font).render(matrix, score, moving_direction)
+        assert np.array_equal(pygame.surfarray.array3d(display), pygame.surfarray.array3d(reference))
+    pygame.quit()
+
+
+def test_sprites_are_loaded_once():
+    """
+    Tests rendering with pictures for head and food: the sprites are scaled and rotated once and reused by every
+    renderer.
+
+    :return:
+    """
+    formatting = {kind: dict(block_format) for kind, block_format in FORMATTING.items()}
+    formatting['head']['picture'] = HEAD_PICTURE
+    formatting['food']['picture'] = FOOD_PICTURE
+    load_sprite.cache_clear()
+    test_dirty_rendering_matches_full_rendering(formatting)
+
+    # four directions of the head and one apple
+    assert load_sprite.cache_info().currsize == 5
+    pygame.init()
+    display = pygame.display.set_mode((40, 40))
+    renderer = BoardRenderer(display, 10, formatting, pygame.font.SysFont('comicsansms', 15, bold=True))
+    assert renderer.sprites['food'].get_size() == (10, 10)
+    assert renderer.head_sprites[(0, 1)] is not renderer.head_sprites[(1, 0)]
+    pygame.quit()
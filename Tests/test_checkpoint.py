@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pytest
+import torch
+
+import checkpoint
+from checkpoint import save_checkpoint, load_checkpoint, checkpoint_exists
+from pytorch_player import PyTorchPlayer
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    """
+    Tests that a restored player continues training exactly like the saved one.
+
+    :return:
+    """
+    player = PyTorchPlayer(plot=False, prioritized=True, target_update=5)
+    n = 300
+    rng = np.random.default_rng(0)
+    player.memory.extend(rng.integers(0, 2, (n, 12)), rng.integers(0, 4, n), rng.normal(size=n),
+                         rng.integers(0, 2, (n, 12)), np.zeros(n, dtype=bool))
+    for _ in range(3):
+        player.train_long_memory(player.memory)
+    player.record_game(10)
+
+    path = str(tmp_path / 'checkpoint')
+    save_checkpoint(player, path)
+    save_checkpoint(player, path)  # replacing an existing checkpoint
+    restored = PyTorchPlayer(plot=False, prioritized=True, target_update=5)
+    load_checkpoint(restored, path)
+
+    assert restored.counter_games == 3 and len(restored.memory) == n and len(restored.history) == 1
+    player.train_long_memory(player.memory)
+    restored.train_long_memory(restored.memory)
+    for parameter, restored_parameter in zip(player.model.parameters(), restored.model.parameters()):
+        assert torch.equal(parameter, restored_parameter)
+    assert np.array_equal(player.memory.priorities.tree, restored.memory.priorities.tree)
+
+
+def test_checkpoint_recovery(tmp_path, monkeypatch):
+    """
+    Tests that saving after a crash between the renames keeps the only valid checkpoint until its replacement is in
+    place, and that a loaded checkpoint does not keep its files mapped.
+
+    :return:
+    """
+    player = PyTorchPlayer(plot=False)
+    n = 50
+    rng = np.random.default_rng(1)
+    player.memory.extend(rng.integers(0, 2, (n, 12)), rng.integers(0, 4, n), rng.normal(size=n),
+                         rng.integers(0, 2, (n, 12)), np.zeros(n, dtype=bool))
+    path = str(tmp_path / 'checkpoint')
+    save_checkpoint(player, path)
+    os.rename(path, f'{path}.old')  # crash after the current checkpoint was moved away
+
+    restored = PyTorchPlayer(plot=False)
+    load_checkpoint(restored, path)
+    assert len(restored.memory) == n and not isinstance(restored.memory.states, np.memmap)
+
+    rename = os.rename
+
+    def failing_rename(source, destination):
+        if source.endswith('.tmp'):
+            raise OSError('crash')
+        rename(source, destination)
+
+    monkeypatch.setattr(checkpoint.os, 'rename', failing_rename)
+    with pytest.raises(OSError):
+        save_checkpoint(restored, path)
+    assert checkpoint_exists(path) and os.path.isdir(f'{path}.old')
+
+    monkeypatch.setattr(checkpoint.os, 'rename', rename)
+    save_checkpoint(restored, path)
+    assert os.path.isdir(path) and not os.path.exists(f'{path}.old')
+    load_checkpoint(PyTorchPlayer(plot=False), path)
@@ -0,0 +1,97 @@
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from game import Game
+from interaction_handler import InteractionHandler
+
+
+class ScriptedInteractions(InteractionHandler):
+    """
+    Plays a fixed sequence of moves and records the pushed board states.
+    """
+
+    def __init__(self, moves: List[Tuple[int, int]]):
+        self.moves = list(moves)
+        self.matrices = []
+
+    def get_encoding_dict(self):
+        return {'head': 101, 'wall': 1, 'valid': 0, 'snake': 100, 'food': 200}
+
+    def push_board_status(self, geometry_matrix, moving_direction, current_score, food_score) -> None:
+        self.matrices.append(np.copy(geometry_matrix))
+
+    def get_interaction(self):
+        return self.moves.pop(0) if self.moves else (0, 1)
+
+
+def test_game_incremental_occupying_matrix():
+    """
+    Tests that the in place updated occupying matrix equals a matrix built from scratch on every tick.
+
+    :return:
+    """
+    board = np.zeros((6, 6), dtype=int)
+    moves = [(0, 1), (0, 1), (1, 0), (1, 0), (0, -1), (0, -1), (-1, 0), (0, 1)]
+    game = Game(board, snake_start=(3, 3), food_start=(3, 4), random_seed=3)
+
+    expected = []
+
+    class CheckingInteractions(ScriptedInteractions):
+        def push_board_status(self, geometry_matrix, moving_direction, current_score, food_score) -> None:
+            super().push_board_status(geometry_matrix, moving_direction, current_score, food_score)
+            expected.append(game._build_occupying_matrix())
+
+    handler = CheckingInteractions(moves)
+    game.run_game(handler)
+
+    assert len(handler.matrices) > 2
+    for matrix, expected_matrix in zip(handler.matrices[:-1], expected[:-1]):
+        assert np.array_equal(matrix, expected_matrix)
+    assert not game.get_occupying_matrix(handler).flags.writeable
+
+
+def test_game_free_fields():
+    """
+    Tests that the free fields always consist of the valid fields not covered by snake or food.
+
+    :return:
+    """
+    board = np.zeros((5, 5), dtype=int)
+    game = Game(board, snake_start=(2, 2), random_seed=7)
+    valid_fields = {tuple(coord) for coord in np.argwhere(game.board.board_matrix == 0).tolist()}
+    moves = [(0, 1), (0, 1), (1, 0), (1, 0), (0, -1), (0, -1), (0, -1), (-1, 0), (-1, 0), (-1, 0), (0, 1)]
+
+    class CheckingInteractions(ScriptedInteractions):
+        def push_board_status(self, geometry_matrix, moving_direction, current_score, food_score) -> None:
+            super().push_board_status(geometry_matrix, moving_direction, current_score, food_score)
+            assert set(game.free_fields.fields) == valid_fields - set(game.snake.body) - {game.food.position}
+            assert len(game.free_fields) == len(game.free_fields.positions)
+
+    game.run_game(CheckingInteractions(moves))
+
+
+def test_game_step_and_reset():
+    """
+    Tests the step/reset interface: rewards, termination and a fresh start after reset.
+
+    :return:
+    """
+    board = np.zeros((5, 5), dtype=int)
+    game = Game(board, snake_start=(2, 2), food_start=(2, 3), verbose=False)
+    observation = game.reset()
+    assert observation[2, 2] == 101 and observation[2, 3] == 200
+
+    observation, reward, done, info = game.step((0, 1))
+    assert reward == 10 and not done and info['score'] == 10 and observation[2, 3] == 101
+
+    for _ in range(4):
+        observation, reward, done, info = game.step((0, 1))
+    assert done and info['collision'] == 'wall'
+    with pytest.raises(RuntimeError):
+        game.step((0, 1))
+    assert np.count_nonzero(observation == 101) == 1
+
+    observation = game.reset()
+    assert game.game_score == 0 and game.snake.body == [(2, 2)] and observation[2, 3] == 200
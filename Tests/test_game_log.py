@@ -0,0 +1,82 @@
+import os
+import random
+
+import numpy as np
+import pygame
+
+from game import Game
+from actions import NONE
+from game_log import GameLog, HEADER, STANDSTILL_DTYPE
+from interaction_handler import InteractionHandler, default_encoding
+from pygame_interactions import PygameInteractions
+from replay import replay_game
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+class RandomInteractions(InteractionHandler):
+    """
+    Stands still for two ticks and then moves randomly with another standstill of two ticks after the fifth tick.
+    """
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.ticks = 0
+
+    def get_encoding_dict(self):
+        return default_encoding
+
+    def get_interaction(self):
+        self.ticks += 1
+        if self.ticks <= 2 or 6 <= self.ticks <= 7:
+            return 0, 0
+        return self.random.choice([(-1, 0), (0, -1), (1, 0), (0, 1)])
+
+
+def play_recorded_game(seed):
+    board = np.zeros((6, 7), dtype=int)
+    board[2, 1:4] = 1
+    game = Game(board, random_seed=seed, verbose=False, record=True)
+    game.run_game(RandomInteractions(seed))
+    return game
+
+
+def test_game_log_round_trip(tmp_path):
+    """
+    Tests that the binary log restores board, seed, moves and standstills and packs four moves into each byte.
+
+    :return:
+    """
+    game = play_recorded_game(6)
+    log = game.log
+    assert log.idle_ticks == 2 and log.final_score == game.game_score
+    assert log.standstills == [[0, 2], [3, 2]] and log.actions()[5:7].tolist() == [NONE, NONE]
+
+    path = str(tmp_path / 'game.snk')
+    log.save(path)
+    restored = GameLog.load(path)
+    n_moves = len(log) - 4
+    assert os.path.getsize(path) == (HEADER.size + (6 * 7 + 7) // 8 + (n_moves + 3) // 4
+                                     + 2 * STANDSTILL_DTYPE.itemsize)
+    assert np.array_equal(restored.board_dim, log.board_dim) and restored.random_seed == 6
+    assert np.array_equal(restored.actions(), log.actions()) and restored.snake_start is None
+    assert restored.standstills == log.standstills and len(restored) == len(log)
+
+
+def test_replay_reproduces_games():
+    """
+    Tests that headless and rendered replays end with the recorded score and board.
+
+    :return:
+    """
+    for seed in range(10):
+        game = play_recorded_game(seed)
+        log = GameLog.from_bytes(game.log.to_bytes())
+        replayed = replay_game(log)
+        assert replayed.game_score == game.game_score and replayed.snake.body == game.snake.body
+
+    pygame.init()
+    display = pygame.display.set_mode((11 * 10, 10 * 10))
+    shown = replay_game(log, PygameInteractions(display, 10, ticks_per_second=1000))
+    assert shown.snake.body == game.snake.body
+    pygame.quit()
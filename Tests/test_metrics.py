@@ -0,0 +1,20 @@
+import numpy as np
+
+from metrics import MetricsLog
+
+
+def test_metrics_log(tmp_path):
+    """
+    Tests that the log grows beyond its initial capacity and that the dump contains all games.
+
+    :return:
+    """
+    log = MetricsLog(capacity=2)
+    for game in range(5):
+        log.append(game, 10 * game, game + 1)
+
+    assert len(log) == 5 and log.scores.tolist() == [0, 10, 20, 30, 40] and log.moves[-1] == 5
+
+    path = str(tmp_path / 'metrics.npy')
+    log.dump(path)
+    assert np.array_equal(np.load(path), np.stack((log.games, log.scores, log.moves), axis=1))
@@ -0,0 +1,35 @@
+import sys
+
+import numpy as np
+import pytest
+import torch.multiprocessing as mp
+
+from parallel_training import receive_game, train_parallel
+
+
+def test_train_parallel():
+    """
+    Tests a short training run of the learner with two actor processes.
+
+    :return:
+    """
+    board = np.zeros((8, 8), dtype=int)
+    learner = train_parallel(board, n_workers=2, sync_interval=2, n_games=4, plot=False)
+
+    assert learner.counter_games == 4 and len(learner.history) == 4 and len(learner.memory) > 0
+
+
+def test_receive_game_from_exited_actor():
+    """
+    Tests that the learner stops waiting for games when an actor exited.
+
+    :return:
+    """
+    context = mp.get_context('spawn')
+    transition_queue = context.Queue()
+    worker = context.Process(target=sys.exit, args=(3,))
+    worker.start()
+    worker.join()
+
+    with pytest.raises(RuntimeError, match='code 3'):
+        receive_game(transition_queue, [worker], timeout=0.1)
@@ -0,0 +1,54 @@
+import urllib.request
+
+import numpy as np
+
+from game import Game
+from headless_interactions import HeadlessInteractionHandler
+from profiling import Histogram, Profiler, SMALLEST_BUCKET
+from random_player import RandomPlayer
+
+
+def test_histogram_buckets():
+    """
+    Tests that durations are counted in power of two buckets.
+
+    :return:
+    """
+    histogram = Histogram()
+    for duration in (0, 2 ** SMALLEST_BUCKET - 1, 2 ** SMALLEST_BUCKET, 2 ** 60):
+        histogram.record(duration)
+    assert histogram.counts[0] == 2 and histogram.counts[1] == 1 and histogram.counts[-1] == 1
+    assert histogram.count == 4 and histogram.total == 2 ** 60 + 2 ** (SMALLEST_BUCKET + 1) - 1
+
+
+def test_profiled_game(tmp_path):
+    """
+    Tests that profiling does not change the game and that the measurements are exported.
+
+    :return:
+    """
+    board = np.zeros((8, 8), dtype=int)
+    plain = Game(board, random_seed=3, verbose=False)
+    plain.run_game(HeadlessInteractionHandler(RandomPlayer(3)))
+
+    path = str(tmp_path / 'snake.prom')
+    profiler = Profiler(path=path, interval=0)
+    profiled = Game(board, random_seed=3, verbose=False, profiler=profiler)
+    player = RandomPlayer(3)
+    profiled.run_game(HeadlessInteractionHandler(player))
+
+    assert profiled.snake.body == plain.snake.body and profiled.game_score == plain.game_score
+    assert profiler.counters['ticks'] == player.ticks and profiler.counters['games'] == 1
+    assert profiler.histograms['step'].count == player.ticks
+
+    with open(path) as file:
+        text = file.read()
+    assert f'snake_phase_seconds_count{{phase="tick"}} {player.ticks}' in text
+    assert f'snake_ticks_total {player.ticks}' in text
+
+    server = profiler.serve(0, host='127.0.0.1')
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}/metrics') as response:
+            assert response.read().decode() == profiler.export()
+    finally:
+        server.shutdown()
@@ -0,0 +1,147 @@
+import numpy as np
+import torch
+
+from game import Game
+from headless_interactions import HeadlessInteractionHandler
+from pytorch_player import PyTorchPlayer
+from state_features import N_FEATURES
+
+
+def play_games(player: PyTorchPlayer, board: np.ndarray, n_games: int) -> None:
+    """
+    Plays and trains on n_games headless games.
+    """
+    for seed in range(n_games):
+        game = Game(board, random_seed=seed, verbose=False)
+        interacter = HeadlessInteractionHandler(player=player)
+        player.encoding = interacter.get_encoding_dict()
+        player.new_round()
+        game.run_game(interacter)
+        player.closing_action(game.game_score)
+
+
+def filled_player(n: int = 64, done: bool = False, **options) -> PyTorchPlayer:
+    """
+    :param n: number of random transitions in the memory
+    :param done: whether the transitions are terminal
+    :return: player with the options and a memory of random feature transitions
+    """
+    player = PyTorchPlayer(plot=False, memory_capacity=n, **options)
+    rng = np.random.default_rng(0)
+    player.memory.extend(rng.integers(0, 2, (n, N_FEATURES)), rng.integers(0, 4, n), rng.normal(size=n),
+                         rng.integers(0, 2, (n, N_FEATURES)), np.full(n, done))
+    return player
+
+
+def parameters(model: torch.nn.Module) -> list:
+    return [parameter.detach().clone() for parameter in model.parameters()]
+
+
+def test_hard_target_update():
+    """
+    Tests that the target model is synced every target_update gradient steps and unchanged in between.
+
+    :return:
+    """
+    player = filled_player(target_update=3)
+    initial = parameters(player.target_model)
+    for _ in range(2):
+        player.train_step(player.memory, 16)
+        assert all(torch.equal(target, parameter)
+                   for target, parameter in zip(player.target_model.parameters(), initial))
+    player.train_step(player.memory, 16)
+    assert all(torch.equal(target, online) for target, online in zip(player.target_model.parameters(),
+                                                                      player.model.parameters()))
+
+
+def test_soft_target_update():
+    """
+    Tests that the soft update blends the online model into the target model after each step.
+
+    :return:
+    """
+    player = filled_player(tau=0.1)
+    player.train_step(player.memory, 16)
+    target_before = parameters(player.target_model)
+    player.train_step(player.memory, 16)
+    for target, before, online in zip(player.target_model.parameters(), target_before, player.model.parameters()):
+        assert torch.allclose(target, 0.9 * before + 0.1 * online)
+
+
+def test_double_dqn_next_state_value():
+    """
+    Tests that Double-DQN evaluates the action selected by the online model with the target model.
+
+    :return:
+    """
+    player = filled_player(target_update=1)
+    next_state = torch.rand(8, N_FEATURES)
+    target_q_values = player.target_model(next_state)
+    # the online model prefers the actions the target model values least
+    online_q_values = -target_q_values
+
+    assert torch.equal(player.next_state_value(next_state, online_q_values), target_q_values.max(dim=1)[0])
+    player.double_dqn = True
+    assert torch.equal(player.next_state_value(next_state, online_q_values), target_q_values.min(dim=1)[0])
+
+
+def test_terminal_targets():
+    """
+    Tests that terminal transitions are not bootstrapped, with and without target model.
+
+    :return:
+    """
+    for options in ({}, {'target_update': 5}):
+        player = filled_player(done=True, prioritized=True, **options)
+        td_errors = []
+        player.memory.update_priorities = lambda indices, td_error: td_errors.append((indices, td_error))
+        player.memory.sample_indices = lambda batch_size: np.arange(16)
+        state, action, reward, _, _ = player.memory.gather(np.arange(16))
+        with torch.no_grad():
+            expected = reward - player.model(state).gather(1, action.unsqueeze(1)).squeeze(1)
+        player.train_step(player.memory, 16)
+        assert np.allclose(td_errors[0][1], expected.numpy(), atol=1e-6)
+
+
+def test_board_observation_mode():
+    """
+    Tests the player on board observations: acting leaves the statistics of the batch normalization of QNet unchanged
+    and does not depend on the other states of the batch, and the soft update blends the statistics into the target
+    model.
+
+    :return:
+    """
+    player = PyTorchPlayer(plot=False, memory_capacity=1000, board_shape=(10, 11), n_frames=2, tau=0.5,
+                           train_interval=4, batch_size=8)
+    play_games(player, np.zeros((6, 7), dtype=int), 1)
+    assert player.counter_games == 1 and player.counter_updates > 0
+    assert not player.model.training and not player.target_model.training
+
+    player.counter_games = 100  # no exploration
+    rng = np.random.default_rng(0)
+    states = player.memory.states[:5]
+    running_mean = player.model.bn1.running_mean.clone()
+    actions = player.act_batch(states, rng)
+    player.new_status = {'predictor_vector': states[0]}
+    assert player.predict_action() == actions[0] == player.act_batch(states[:1], rng)[0]
+    assert torch.equal(player.model.bn1.running_mean, running_mean)
+
+    target_mean = player.target_model.bn1.running_mean.clone()
+    player.train_step(player.memory, 8)
+    assert not torch.equal(player.model.bn1.running_mean, running_mean)
+    assert torch.allclose(player.target_model.bn1.running_mean, (target_mean + player.model.bn1.running_mean) / 2)
+    assert torch.equal(player.target_model.bn1.num_batches_tracked, player.model.bn1.num_batches_tracked)
+
+
+def test_close_stops_plot_process():
+    """
+    Tests that closing the player joins its plot process.
+
+    :return:
+    """
+    player = PyTorchPlayer(plot=True, memory_capacity=100)
+    process = player.plot.process
+    player.record_game(0)
+    player.close()
+    assert not process.is_alive() and player.plot is None
+    player.close()
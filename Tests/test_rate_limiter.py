@@ -0,0 +1,76 @@
+import os
+import time
+
+import numpy as np
+import pygame
+
+from game import Game
+from pygame_interactions import PygameInteractions
+from pytorch_interactions import PyGamePyTorchInteractionHandler
+from random_player import RandomPlayer
+from rate_limiter import RateLimiter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+def test_rate_limiter():
+    """
+    Tests that events are limited to the rate and that an unlimited rate never blocks.
+
+    :return:
+    """
+    limiter = RateLimiter(100)
+    start = time.perf_counter()
+    for _ in range(5):
+        limiter.wait()
+    assert 0.035 < time.perf_counter() - start < 0.5
+    assert not limiter.ready()
+
+    unlimited = RateLimiter(None)
+    assert unlimited.ready() and unlimited.remaining() == 0
+
+
+def test_buffered_input_and_capped_rendering():
+    """
+    Tests that key presses between two ticks are applied one per tick and that frames above the frame rate are
+    skipped.
+
+    :return:
+    """
+    pygame.init()
+    display = pygame.display.set_mode((100, 100))
+    interactions = PygameInteractions(display, 10, ticks_per_second=1000, frames_per_second=10)
+
+    for key in (pygame.K_UP, pygame.K_UP, pygame.K_LEFT):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+    assert [interactions.get_interaction() for _ in range(3)] == [(-1, 0), (0, -1), (0, -1)]
+
+    board = np.zeros((10, 10), dtype=int)
+    board[0, :] = 1
+    rendered = []
+    interactions.push_board_status(board, (0, 0), 0, 1)
+    interactions.renderer.render = lambda *frame: rendered.append(frame)
+    for tick in range(20):
+        interactions.push_board_status(board, (0, 0), tick, 1)
+    assert len(rendered) == 0 and interactions.pending_frame is not None
+    interactions.finish_game()
+    assert len(rendered) == 1 and rendered[0][1] == 19 and interactions.pending_frame is None
+    pygame.quit()
+
+
+def test_final_board_is_rendered():
+    """
+    Tests that the board of the crash is drawn although no frame is due when a game of the AI ends.
+
+    :return:
+    """
+    pygame.init()
+    display = pygame.display.set_mode((100, 100))
+    interactions = PyGamePyTorchInteractionHandler(RandomPlayer(), display, 10, frames_per_second=1)
+    game = Game(np.zeros((6, 6), dtype=int), random_seed=0, verbose=False)
+    rendered = []
+    interactions.push_board_status(game.get_occupying_matrix(interactions), (0, 1), 0, 1)
+    interactions.renderer.render = lambda *frame: rendered.append(frame)
+    game.run_game(interactions)
+    assert game.done and np.array_equal(rendered[-1][0], game.get_occupying_matrix(interactions))
+    pygame.quit()
@@ -0,0 +1,71 @@
+import numpy as np
+
+from replay_buffer import ReplayBuffer, SumTree, PrioritizedReplayBuffer
+
+
+def test_replay_buffer_ring():
+    """
+    Tests that the buffer overwrites the oldest transitions once the capacity is reached.
+
+    :return:
+    """
+    buffer = ReplayBuffer(capacity=3, state_size=2)
+    for i in range(4):
+        buffer.append(np.array([i, i]), i % 4, float(i), np.array([i + 1, i + 1]), i == 3)
+
+    assert len(buffer) == 3 and buffer.position == 1
+    assert sorted(buffer.actions.tolist()) == [1, 2, 3] and buffer.states[0].tolist() == [3, 3]
+
+    buffer.extend(np.zeros((2, 2)), np.array([0, 0]), np.zeros(2), np.zeros((2, 2)), np.zeros(2, dtype=bool))
+    assert buffer.actions.tolist() == [3, 0, 0] and buffer.position == 0
+
+
+def test_replay_buffer_sample():
+    """
+    Tests that samples are distinct transitions and converted to tensors of the expected shape.
+
+    :return:
+    """
+    buffer = ReplayBuffer(capacity=100, state_size=12, random_seed=0)
+    n = 50
+    buffer.extend(np.ones((n, 12)), np.arange(n) % 4, np.arange(n, dtype=float), np.zeros((n, 12)),
+                  np.zeros(n, dtype=bool))
+
+    state, action, reward, next_state, done = buffer.sample(20)
+    assert state.shape == (20, 12) and state.dtype.is_floating_point
+    assert len(set(reward.tolist())) == 20
+    assert len(buffer.sample(1000)[0]) == n
+
+
+def test_sum_tree_sampling():
+    """
+    Tests that the sum tree finds the leaves proportional to their priority and keeps the total after updates.
+
+    :return:
+    """
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 0.0, 2.0, 0.0, 1.0]))
+    assert tree.total() == 4.0
+    assert tree.find(np.array([0.5, 1.0, 2.9, 3.5])).tolist() == [0, 2, 2, 4]
+
+    tree.update(np.array([2, 2]), np.array([5.0, 5.0]))
+    assert tree.total() == 7.0
+
+
+def test_prioritized_replay_buffer():
+    """
+    Tests that transitions with a large TD error are sampled more often and get smaller importance weights.
+
+    :return:
+    """
+    buffer = PrioritizedReplayBuffer(capacity=10, state_size=2, random_seed=0, alpha=1.0)
+    n = 10
+    indices = buffer.extend(np.zeros((n, 2)), np.zeros(n), np.zeros(n), np.zeros((n, 2)), np.zeros(n, dtype=bool))
+    td_errors = np.zeros(n)
+    td_errors[3] = 100
+    buffer.update_priorities(indices, td_errors)
+
+    sampled = buffer.sample_indices(10)
+    assert np.count_nonzero(sampled == 3) >= 8
+    weights = buffer.importance_weights(np.array([3, 0]))
+    assert weights[0] < weights[1] == 1
@@ -0,0 +1,117 @@
+import math
+import os
+
+import numpy as np
+
+from board import Board, load_level
+from game import Game
+from search_player import SearchPlayer, hamiltonian_cycle
+
+LEVELS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'levels')
+
+
+def play(player: SearchPlayer, board: Board, max_ticks: int) -> Game:
+    """
+    Plays until the snake crashes, fills the board or max_ticks passed and checks the body tracked by the player.
+
+    :return: game after the last tick
+    """
+    game = Game(board, random_seed=5, verbose=False)
+    observation = game.reset()
+    for _ in range(max_ticks):
+        player.push_board_status(observation, game.snake.get_moving_direction(), game.game_score,
+                                 game.food.get_score())
+        assert list(player.body) == game.snake.body
+        observation, _, done, _ = game.step(player.get_response())
+        if done or len(game.snake) == player.n_fields - 1:
+            break
+    return game
+
+
+def test_hamiltonian_cycle():
+    """
+    Tests that the cycle visits all fields with steps between neighbours and that it only exists on suitable boards.
+
+    :return:
+    """
+    for shape in ((4, 6), (5, 6), (6, 5), (2, 3)):
+        board = Board(np.zeros(shape, dtype=int))
+        cycle = hamiltonian_cycle(board)
+        fields = np.argsort(cycle[2:-2, 2:-2], axis=None)
+        rows, cols = np.unravel_index(fields, shape)
+        assert np.array_equal(np.sort(cycle[2:-2, 2:-2], axis=None), np.arange(shape[0] * shape[1]))
+        assert np.all(np.abs(np.diff(rows, append=rows[0])) + np.abs(np.diff(cols, append=cols[0])) == 1)
+
+    assert hamiltonian_cycle(Board(np.zeros((5, 7), dtype=int))) is None
+    layout = np.zeros((6, 6), dtype=int)
+    layout[3, 3] = 1
+    assert hamiltonian_cycle(Board(layout)) is None
+
+
+def test_search_player_fills_board():
+    """
+    Tests that the snake fills a board with a Hamiltonian cycle and that the search tree is reused until the food is
+    eaten.
+
+    :return:
+    """
+    board = Board(np.zeros((6, 8), dtype=int))
+    player = SearchPlayer(board)
+    game = play(player, board, 10000)
+    assert len(game.snake) == player.n_fields - 1
+    assert player.plans <= 2 * (len(game.snake) - 1)
+
+
+def test_search_player_level():
+    """
+    Tests that the snake reaches the food on a level with inner walls and survives.
+
+    :return:
+    """
+    board = load_level(os.path.join(LEVELS, 'rooms.txt'))
+    player = SearchPlayer(board)
+    game = play(player, board, 2000)
+    assert player.cycle is None and game.game_score >= 50 and not game.done
+
+
+def test_search_player_unreachable_food():
+    """
+    Tests that food enclosed by walls is searched once and not in every tick, while the snake keeps moving.
+
+    :return:
+    """
+    layout = np.zeros((12, 12), dtype=int)
+    layout[7:10, 7:10] = 1
+    layout[8, 8] = 0
+    board = Board(layout)
+    player = SearchPlayer(board)
+    game = Game(board, snake_start=(4, 4), food_start=(10, 10), random_seed=0, verbose=False)
+    observation = game.reset()
+    for _ in range(100):
+        player.push_board_status(observation, game.snake.get_moving_direction(), game.game_score,
+                                 game.food.get_score())
+        observation, _, done, _ = game.step(player.get_response())
+        assert not done
+    assert player.plans == 1 and player.retry_tick == math.inf
+
+
+def test_search_player_dead_end():
+    """
+    Tests that the snake does not follow the path to food at the end of a dead end, where it could not turn around.
+
+    :return:
+    """
+    layout = np.zeros((8, 8), dtype=int)
+    layout[1:5, 2] = 1
+    layout[1:5, 4] = 1
+    layout[4, 3] = 1
+    board = Board(layout)
+    player = SearchPlayer(board)
+    game = Game(board, snake_start=(8, 8), food_start=(5, 5), random_seed=0, verbose=False)
+    observation = game.reset()
+    for _ in range(300):
+        player.push_board_status(observation, game.snake.get_moving_direction(), game.game_score,
+                                 game.food.get_score())
+        observation, _, done, _ = game.step(player.get_response())
+        assert not done
+    assert game.game_score == 0
@@ -1,4 +1,6 @@
+import numpy as np
 import pytest
+from actions import UP, LEFT, DOWN, RIGHT, NONE, to_action, to_actions
 from snake import Snake
 from typing import List, Tuple
 
@@ -43,3 +45,56 @@ def test_snake_get_propagated_head():
     new_head = my_snake.get_propagated_head()
 
     assert expected_propagated_head == new_head
+
+
+def test_snake_occupied_fields():
+    """
+    Tests that the occupied fields follow the body and that the snake may move into its own tail.
+
+    :return:
+    """
+    my_snake = Snake(body=[(1, 1), (1, 2), (2, 2), (2, 1)])
+    my_snake.change_moving_direction((-1, 0))
+    success = my_snake.update()
+
+    assert success and my_snake.body == [(1, 2), (2, 2), (2, 1), (1, 1)]
+    assert my_snake.occupies((1, 1)) and not my_snake.occupies((3, 3)) and len(my_snake) == 4
+
+
+def test_snake_action_encoding():
+    """
+    Tests that encoded actions and (x, y) directions are interchangeable and that reversals are ignored.
+
+    :return:
+    """
+    my_snake = Snake(body=[(3, 3)])
+    assert my_snake.action == NONE and my_snake.get_moving_direction() == (0, 0)
+
+    my_snake.change_moving_direction(RIGHT)
+    assert my_snake.get_moving_direction() == (0, 1)
+    my_snake.change_moving_direction((0, -1))  # reversal
+    assert my_snake.action == RIGHT
+    my_snake.change_moving_direction(UP)
+    my_snake.change_moving_direction(DOWN)  # reversal
+    assert my_snake.get_propagated_head() == (2, 3)
+
+    assert to_actions([(-1, 0), (0, -1), (1, 0), (0, 1)]).tolist() == [UP, LEFT, DOWN, RIGHT]
+
+
+def test_to_action_sequences():
+    """
+    Tests that directions given as lists or arrays are encoded like tuples.
+
+    :return:
+    """
+    assert to_action([0, 1]) == RIGHT and to_action(np.array([1, 0])) == DOWN and to_action(np.int8(LEFT)) == LEFT
+    assert to_action(np.array([[-1, 0], [0, 1]])[0]) == UP
+    with pytest.raises(ValueError):
+        to_action([1, 1])
+    for offsets in ([(1, 1)], [(2, 0)], [(0, -2)]):
+        with pytest.raises(ValueError):
+            to_actions(np.array([(0, 1)] + offsets))
+
+    my_snake = Snake(body=[(3, 3)])
+    my_snake.change_moving_direction(np.array([0, -1]))
+    assert my_snake.action == LEFT and my_snake.get_propagated_head() == (3, 2)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from batch_game import BatchGame
+from interaction_handler import default_encoding
+from state_features import state_features, batch_state_features
+
+
+def test_state_features():
+    """
+    Tests the features of a hand-made board: wall above, body to the left, food below right.
+
+    :return:
+    """
+    matrix = np.zeros((5, 5), dtype=int)
+    matrix[0, :] = default_encoding['wall']
+    matrix[1, 1] = default_encoding['snake']
+    matrix[1, 2] = default_encoding['head']
+    matrix[3, 4] = default_encoding['food']
+
+    features = state_features(matrix, (1, 2), (3, 4), (0, 1), default_encoding)
+    assert features.tolist() == [1, 1, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1]
+
+
+def test_batch_state_features():
+    """
+    Tests that the batch features equal the features computed for each board on its own.
+
+    :return:
+    """
+    batch = BatchGame(np.zeros((6, 6), dtype=int), n_games=8, random_seed=1)
+    rng = np.random.default_rng(0)
+    directions = np.array([(-1, 0), (0, -1), (1, 0), (0, 1)])
+    for _ in range(5):
+        batch.step(directions[rng.integers(0, 4, size=8)])
+
+    matrices = batch.get_occupying_matrix(default_encoding)
+    heads = batch.get_heads()
+    features = batch_state_features(matrices, heads, batch.food_position, batch.moving_direction, default_encoding)
+    for game in range(8):
+        expected = state_features(matrices[game], tuple(heads[game]), tuple(batch.food_position[game]),
+                                  tuple(batch.moving_direction[game]), default_encoding)
+        assert np.array_equal(features[game], expected)
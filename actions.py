@@ -0,0 +1,54 @@
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+# canonical encoding of the moves; NONE is the standstill before the first move
+UP, LEFT, DOWN, RIGHT, NONE = range(5)
+N_ACTIONS = 4
+ACTION_DTYPE = np.int8
+
+# (x, y) offset of each action
+DIRECTIONS = np.array([(-1, 0), (0, -1), (1, 0), (0, 1), (0, 0)], dtype=np.int64)
+DIRECTION_TUPLES: Tuple[Tuple[int, int], ...] = tuple(map(tuple, DIRECTIONS.tolist()))
+
+# action in the opposite direction of each action
+REVERSAL = np.array([DOWN, RIGHT, UP, LEFT, NONE], dtype=ACTION_DTYPE)
+REVERSAL_TUPLE: Tuple[int, ...] = tuple(REVERSAL.tolist())
+
+# action of the offset (x, y) at ACTION_GRID[x + 1, y + 1]; -1 for diagonal offsets
+ACTION_GRID = np.full((3, 3), -1, dtype=ACTION_DTYPE)
+ACTION_GRID[DIRECTIONS[:, 0] + 1, DIRECTIONS[:, 1] + 1] = np.arange(len(DIRECTIONS))
+ACTION_OF_DIRECTION = {direction: action for action, direction in enumerate(DIRECTION_TUPLES)}
+
+
+def to_action(move: Union[int, Tuple[int, int], Sequence[int], np.ndarray]) -> int:
+    """
+    :param move: action or (x, y) offset of the move as tuple, list or array
+    :return: action of the move
+    """
+    if isinstance(move, tuple):
+        direction = move
+    elif isinstance(move, (int, np.integer)) or np.ndim(move) == 0:
+        return int(move)
+    else:
+        direction = tuple(move)
+    action = ACTION_OF_DIRECTION.get(direction)
+    if action is None:
+        raise ValueError(f'{move} is no offset of a move.')
+    return action
+
+
+def to_actions(moves: np.ndarray) -> np.ndarray:
+    """
+    :param moves: (n,) actions or (n, 2) offsets of the moves
+    :return: (n,) actions of the moves
+    """
+    moves = np.asarray(moves)
+    if moves.ndim == 1:
+        return moves.astype(ACTION_DTYPE, copy=False)
+    if np.any(np.abs(moves) > 1):
+        raise ValueError('The offsets of the moves must be unit steps.')
+    actions = ACTION_GRID[moves[:, 0] + 1, moves[:, 1] + 1]
+    if np.any(actions < 0):
+        raise ValueError('Diagonal offsets are no moves.')
+    return actions
@@ -0,0 +1,193 @@
+from typing import Tuple, Callable, Optional, List, Union
+
+import numpy as np
+
+from actions import NONE, ACTION_DTYPE, DIRECTIONS, REVERSAL, to_actions
+from board import Board
+from game import matrix_dtype
+from interaction_handler import BoardEncodingDict
+
+
+class BatchGame:
+    """
+    Vectorized model of many snake games on the same board layout.
+    All games are advanced together by one array step per tick and follow the same rules as class Game.
+    Finished games are reset automatically, so the batch always consists of running games.
+
+    :ivar n_games: number of games in the batch
+    :ivar walls: matrix of the (padded) playing field; True = invalid
+    :ivar occupancy: (n_games, rows, cols) matrices of the snakes' bodies; True = occupied by snake
+    :ivar body: ring buffer (n_games, capacity, 2) with the coordinates of the snakes' bodies
+    :ivar head_index: index of each snake's head in body
+    :ivar tail_index: index of each snake's tail in body
+    :ivar moving_action: encoded moving directions of the snakes (see actions)
+    :ivar moving_direction: (n_games, 2) moving directions of the snakes
+    :ivar food_position: (n_games, 2) coordinates of the food
+    :ivar food_score: current score of the food of each game
+    :ivar game_score: current score of each game
+    :ivar final_score: score of the last finished game in each slot of the batch
+    """
+
+    def __init__(self, board_dim: Union[np.ndarray, Board], n_games: int, snake_start: Tuple[int, int] = None,
+                 food_start: Tuple[int, int] = None, random_seed: int = 42, score: int = 10,
+                 discount_function: Callable[[np.ndarray], np.ndarray] = lambda x: x):
+        """
+        :param board_dim: matrix of the playing field; 0 = valid; 1 = invalid; or a Board, whose layout is shared
+        :param n_games: number of games played at once
+        :param snake_start: (x, y) start of every snake; random if None
+        :param food_start: (x, y) start of every food; random if None
+        :param random_seed: seed of the random generator used for placing snakes and food
+        :param score: initial score of the food
+        :param discount_function: vectorized function that updates the food scores after each round
+        """
+        self.n_games = n_games
+        self.random = np.random.default_rng(random_seed)
+        self.snake_start = snake_start
+        self.food_start = food_start
+        self.score = score
+        self.discount_function = discount_function
+
+        board = board_dim if isinstance(board_dim, Board) else Board(board_dim)
+        self.walls = board.board_matrix == 1
+        self.capacity = int(np.count_nonzero(~self.walls)) + 1
+        self._games = np.arange(n_games)
+
+        self.occupancy = np.zeros((n_games,) + self.walls.shape, dtype=bool)
+        self.body = np.zeros((n_games, self.capacity, 2), dtype=np.int64)
+        self.head_index = np.zeros(n_games, dtype=np.int64)
+        self.tail_index = np.zeros(n_games, dtype=np.int64)
+        self.moving_action = np.full(n_games, NONE, dtype=ACTION_DTYPE)
+        self.food_position = np.zeros((n_games, 2), dtype=np.int64)
+        self.food_score = np.zeros(n_games, dtype=np.int64)
+        self.game_score = np.zeros(n_games, dtype=np.int64)
+        self.final_score = np.zeros(n_games, dtype=np.int64)
+
+        self.reset(np.ones(n_games, dtype=bool))
+
+    def reset(self, games: np.ndarray) -> None:
+        """
+        Starts new games in the selected slots of the batch.
+
+        :param games: boolean mask of the games to reset
+        """
+        indices = self._games[games]
+        self.occupancy[indices] = False
+        self.head_index[indices] = 0
+        self.tail_index[indices] = 0
+        self.moving_action[indices] = NONE
+        self.food_score[indices] = self.score
+        self.game_score[indices] = 0
+
+        if self.snake_start is None:
+            heads, _ = self._seed_elements(indices)
+        else:
+            heads = np.tile(self.snake_start, (len(indices), 1))
+        self.body[indices, 0] = heads
+        self.occupancy[indices, heads[:, 0], heads[:, 1]] = True
+
+        if self.food_start is None:
+            self.food_position[indices], _ = self._seed_elements(indices)
+        else:
+            self.food_position[indices] = self.food_start
+
+    @property
+    def moving_direction(self) -> np.ndarray:
+        return DIRECTIONS[self.moving_action]
+
+    def _seed_elements(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draws one free field for each of the selected games with a single array operation.
+
+        :param indices: indices of the games to draw a field for
+        :return: (len(indices), 2) coordinates of the drawn fields and a mask whether a free field existed
+        """
+        free = ~(self.walls | self.occupancy[indices])
+        keys = self.random.random(free.shape)
+        keys[~free] = -1
+        flat_keys = keys.reshape(len(indices), -1)
+        choice = np.argmax(flat_keys, axis=1)
+        found = flat_keys[np.arange(len(indices)), choice] >= 0
+        return np.stack(np.unravel_index(choice, self.walls.shape), axis=1), found
+
+    def step(self, directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Propagates all games by one tick.
+
+        :param directions: (n_games,) encoded actions (see actions) or (n_games, 2) new moving directions of the snakes
+        :return: score gained by each game during the tick and a mask of the games that ended
+        """
+        games = self._games
+        actions = to_actions(directions)
+
+        # do not update, if direction should be reversed
+        self.moving_action = np.where(actions == REVERSAL[self.moving_action], self.moving_action, actions)
+
+        # Get probable new position of snake (head) and check for validity
+        new_head = self.body[games, self.head_index] + DIRECTIONS[self.moving_action]
+        rows, cols = new_head[:, 0], new_head[:, 1]
+        wall_collision = self.walls[rows, cols]
+        eaten = np.all(new_head == self.food_position, axis=1)
+
+        # if snake did not eat, remove tail
+        moving = games[~eaten]
+        tail = self.body[moving, self.tail_index[moving]]
+        self.occupancy[moving, tail[:, 0], tail[:, 1]] = False
+        self.tail_index[moving] = (self.tail_index[moving] + 1) % self.capacity
+
+        # add propagated head and check whether snake crashed into itself
+        self_collision = self.occupancy[games, rows, cols]
+        self.head_index = (self.head_index + 1) % self.capacity
+        self.body[games, self.head_index] = new_head
+        self.occupancy[games, rows, cols] = True
+
+        done = wall_collision | self_collision
+        reward = np.where(eaten, self.food_score, 0)
+        self.game_score += reward
+
+        self.food_score[~eaten] = self.discount_function(self.food_score[~eaten])
+        respawn = games[eaten & ~done]
+        if len(respawn):
+            self.food_position[respawn], found = self._seed_elements(respawn)
+            self.food_score[respawn] = self.score
+            done[respawn[~found]] = True  # board is full
+
+        if np.any(done):
+            self.final_score[done] = self.game_score[done]
+            self.reset(done)
+
+        return reward, done
+
+    def get_heads(self) -> np.ndarray:
+        """
+        :return: (n_games, 2) coordinates of the snakes' heads
+        """
+        return self.body[self._games, self.head_index]
+
+    def get_body(self, game: int) -> List[Tuple[int, int]]:
+        """
+        Returns the body of one snake in the same format as Snake.body.
+
+        :param game: index of the game
+        :return: coordinates of the snake's body (i.e. body[0] is tail, body[-1] is head)
+        """
+        length = (self.head_index[game] - self.tail_index[game]) % self.capacity + 1
+        indices = (self.tail_index[game] + np.arange(length)) % self.capacity
+        return [tuple(coord) for coord in self.body[game, indices].tolist()]
+
+    def get_occupying_matrix(self, symbols: BoardEncodingDict, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Encodes the boards of all games like Game.get_occupying_matrix.
+
+        :param symbols: encoding of the different board elements
+        :param out: optional (n_games, rows, cols) array the matrices are written into
+        :return: (n_games, rows, cols) occupying matrices
+        """
+        if out is None:
+            out = np.empty(self.occupancy.shape, dtype=matrix_dtype(symbols))
+        out[:] = np.where(self.walls, symbols['wall'], symbols['valid'])
+        out[self.occupancy] = symbols['snake']
+
+        heads = self.get_heads()
+        out[self._games, heads[:, 0], heads[:, 1]] = symbols['head']
+        out[self._games, self.food_position[:, 0], self.food_position[:, 1]] = symbols['food']
+        return out
@@ -0,0 +1,84 @@
+import argparse
+import time
+
+import numpy as np
+
+from batch_game import BatchGame
+from interaction_handler import default_encoding
+from pytorch_player import PyTorchPlayer
+from state_features import batch_state_features, N_FEATURES
+
+
+def train_batched(player: PyTorchPlayer, board: np.ndarray, n_games: int = 64, n_ticks: int = None,
+                  seed: int = 0) -> None:
+    """
+    Trains the player on many concurrent games: one batched forward pass per tick selects the moves of all games,
+    and the player's train_interval and batch_size define how often it is trained on minibatches of its memory.
+
+    :param player: player to train; should have train_interval set
+    :param board: matrix of the playing field; 0 = valid; 1 = invalid
+    :param n_games: number of games played at once
+    :param n_ticks: number of ticks to play; if None, training runs until it is interrupted
+    :param seed: seed of games and exploration
+    """
+    random_generator = np.random.default_rng(seed)
+    batch = BatchGame(board, n_games, random_seed=seed)
+    matrices = batch.get_occupying_matrix(default_encoding)
+    features = np.zeros((2, n_games, N_FEATURES), dtype=np.uint8)
+    batch_state_features(matrices, batch.get_heads(), batch.food_position, batch.moving_direction, default_encoding,
+                         out=features[0])
+    moves = np.zeros(n_games, dtype=np.int64)
+    record = 0
+
+    tick = 0
+    while n_ticks is None or tick < n_ticks:
+        state, next_state = features[tick % 2], features[(tick + 1) % 2]
+        actions = player.act_batch(state, random_generator)
+        score, done = batch.step(actions)
+        moves += 1
+
+        batch.get_occupying_matrix(default_encoding, out=matrices)
+        batch_state_features(matrices, batch.get_heads(), batch.food_position, batch.moving_direction,
+                             default_encoding, out=next_state)
+
+        # same rewards as PyTorchPlayer; the final state of a game is the state before the fatal move
+        reward = np.where(done, -30, score - 1)
+        player.memory.extend(state, actions, reward, np.where(done[:, None], state, next_state), done)
+        player.count_step(n_games)
+        if player.profiler is not None:
+            player.profiler.count('ticks', n_games)
+            player.profiler.count('games', int(np.count_nonzero(done)))
+            player.profiler.maybe_dump()
+
+        for game in np.flatnonzero(done):
+            player.counter_games += 1
+            player.counter_move = moves[game]
+            player.record_game(batch.final_score[game])
+            record = max(record, batch.final_score[game])
+            print('Game:', player.counter_games, '\tScore:', batch.final_score[game], '\tTurns:', moves[game])
+            print('Record:\t\t\t', record)
+        moves[done] = 0
+        tick += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the snake AI on many concurrent games.')
+    parser.add_argument('--games', type=int, default=64, help='number of games played at once')
+    parser.add_argument('--train-interval', type=int, default=16, help='moves between minibatch updates')
+    parser.add_argument('--batch-size', type=int, default=256, help='size of the minibatches')
+    args = parser.parse_args()
+
+    # Define board
+    width = 25
+    height = 20
+    board = np.zeros((height+2, width+2), dtype=int)
+
+    player = PyTorchPlayer(train_interval=args.train_interval, batch_size=args.batch_size)
+    try:
+        train_batched(player, board, args.games, seed=time.time_ns() % 2**32)
+    finally:
+        player.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,117 @@
+import os
+from functools import cached_property, lru_cache
 from typing import Tuple
 
 import numpy as np
 
+from actions import DIRECTIONS, N_ACTIONS
+
+# characters of the level files
+WALL = '#'
+FREE = '.'
+
+
+def edge_mask(x: np.ndarray, width: int = 1) -> np.ndarray:
+    """
+    :param x: matrix
+    :param width: width of the edge
+    :return: boolean mask that is True on the outer width rows and columns of x
+    """
+    mask = np.ones(x.shape, dtype=bool)
+    mask[x.ndim * (slice(width, -width),)] = False
+    return mask
+
 
 class Board(object):
     """
     Model of gaming board.
+    The board is immutable: the padded layout is stored once as read-only uint8 matrix, so a single Board can be shared
+    by any number of games (pass it instead of the matrix of the playing field) and can be memory-mapped from a file.
+    Levels are loaded from text files with load_level. Static lookup tables of the layout are computed once per board
+    on first use.
 
-    :ivar board_matrix: matrix of the playing field; 0 = valid; 1 = invalid
+    :ivar board_matrix: padded matrix of the playing field; 0 = valid; 1 = invalid
+    :ivar valid_neighbours: (4, rows, cols) True if the neighbour in the direction (up, left, down, right) is no wall
     """
 
     def __init__(self, board_matrix: np.ndarray):
-        self.board_matrix = np.ones((board_matrix.shape[0]+4, board_matrix.shape[1]+4), dtype=int)
-        self.board_matrix[2:-2, 2:-2] = board_matrix
+        padded_matrix = np.ones((board_matrix.shape[0]+4, board_matrix.shape[1]+4), dtype=np.uint8)
+        padded_matrix[2:-2, 2:-2] = board_matrix
+        self._set_board_matrix(padded_matrix)
+
+    def _set_board_matrix(self, padded_matrix: np.ndarray) -> None:
+        self.board_matrix = padded_matrix.view()
+        self.board_matrix.flags.writeable = False
+
+    @classmethod
+    def from_padded(cls, padded_matrix: np.ndarray) -> 'Board':
+        """
+        Creates a board from an already padded layout without copying it.
+
+        :param padded_matrix: uint8 matrix of the playing field including the walls of width 2
+        :return: board using padded_matrix
+        """
+        if padded_matrix.dtype != np.uint8:
+            raise ValueError('The padded layout must be stored as uint8.')
+        board = cls.__new__(cls)
+        board._set_board_matrix(padded_matrix)
+        return board
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Board':
+        """
+        Parses a level: one line per row of the playing field, '#' for walls and '.' for valid fields. The level is
+        padded with walls like any other board.
+
+        :param text: content of a level file
+        :return: board of the level
+        """
+        rows = [line.rstrip() for line in text.splitlines() if line.strip()]
+        if not rows or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError('A level must consist of rows of equal length.')
+        if set(''.join(rows)) - {WALL, FREE}:
+            raise ValueError(f'A level may only contain {WALL!r} and {FREE!r}.')
+        return cls(np.array([[field == WALL for field in row] for row in rows], dtype=np.uint8))
+
+    @cached_property
+    def valid_neighbours(self) -> np.ndarray:
+        rows, cols = self.board_matrix.shape
+        # outside of the matrix counts as wall
+        walls = np.ones((rows + 2, cols + 2), dtype=bool)
+        walls[1:-1, 1:-1] = self.board_matrix == 1
+        valid_neighbours = np.empty((N_ACTIONS, rows, cols), dtype=bool)
+        for action, (row_offset, col_offset) in enumerate(DIRECTIONS[:N_ACTIONS]):
+            neighbours = walls[1 + row_offset:1 + row_offset + rows, 1 + col_offset:1 + col_offset + cols]
+            valid_neighbours[action] = ~neighbours
+        valid_neighbours.flags.writeable = False
+        return valid_neighbours
+
+    @property
+    def layout(self) -> np.ndarray:
+        """
+        :return: read-only view of the playing field without padding; 0 = valid; 1 = invalid
+        """
+        return self.board_matrix[2:-2, 2:-2]
+
+    def save(self, path: str) -> None:
+        """
+        Writes the padded layout as .npy file.
+
+        :param path: path of the file
+        """
+        np.save(path, self.board_matrix)
+
+    @classmethod
+    def load(cls, path: str, memory_map: bool = True) -> 'Board':
+        """
+        Loads a board written by save.
+
+        :param path: path of the file
+        :param memory_map: if True, the layout is memory-mapped read-only, so that all processes loading the file share
+            its pages
+        :return: loaded board
+        """
+        return cls.from_padded(np.load(path, mmap_mode='r' if memory_map else None))
 
     def check_border_collision(self, new_head: Tuple[int, int]) -> bool:
         """
@@ -28,9 +127,20 @@ class Board(object):
             else:
                 return False
 
-    # old and unused but maybe useful in the future
-    @staticmethod
-    def edge_mask(x: np.ndarray):
-        mask = np.ones(x.shape, dtype=bool)
-        mask[x.ndim * (slice(2, -2),)] = False
-        return mask
+
+@lru_cache(maxsize=None)
+def _load_level(path: str, modified: float) -> Board:
+    with open(path) as file:
+        return Board.from_text(file.read())
+
+
+def load_level(path: str) -> Board:
+    """
+    Loads a level file (see Board.from_text). Levels are cached, so all games of a level share one board with its
+    lookup tables; a level is reloaded if its file was modified.
+
+    :param path: path of the level file
+    :return: shared board of the level
+    """
+    path = os.path.abspath(path)
+    return _load_level(path, os.path.getmtime(path))
@@ -0,0 +1,48 @@
+from typing import Tuple, Optional
+
+import numpy as np
+
+from interaction_handler import BoardEncodingDict
+
+# planes of each frame; the walls are static and stored once in channel 0
+FRAME_PLANES = ('head', 'snake', 'food')
+
+
+def observation_shape(board_shape: Tuple[int, int], n_frames: int = 1) -> Tuple[int, int, int]:
+    """
+    :param board_shape: shape of the (padded) occupying matrix
+    :param n_frames: number of stacked frames
+    :return: shape (channels, rows, cols) of the observation
+    """
+    return (1 + len(FRAME_PLANES) * n_frames,) + tuple(board_shape)
+
+
+def board_observation(matrix: np.ndarray, encoding: BoardEncodingDict, previous: Optional[np.ndarray] = None,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Encodes the occupying matrix as uint8 planes: channel 0 are the walls, followed by the planes head, body and food
+    of each stacked frame from the oldest to the newest. The newest frame is appended to the frames of previous; the
+    planes are written in place, so that no memory is allocated if out is given.
+
+    :param matrix: occupying matrix of the board
+    :param encoding: encoding of the board elements
+    :param previous: observation of the previous tick; if None, all frames show the current board
+    :param out: array of the observation shape the planes are written into; must not be previous
+    :return: observation as 0/1 values
+    """
+    if out is None:
+        out = np.empty(observation_shape(matrix.shape, 1 if previous is None else
+                                         (len(previous) - 1) // len(FRAME_PLANES)), dtype=np.uint8)
+    n_planes = len(FRAME_PLANES)
+    newest = out[-n_planes:]
+    for plane, kind in zip(newest, FRAME_PLANES):
+        np.equal(matrix, encoding[kind], out=plane.view(bool))
+
+    if previous is None:
+        np.equal(matrix, encoding['wall'], out=out[0].view(bool))
+        for frame in range(1, len(out) - n_planes, n_planes):
+            out[frame:frame + n_planes] = newest
+    else:
+        out[0] = previous[0]
+        out[1:-n_planes] = previous[1 + n_planes:]
+    return out
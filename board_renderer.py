@@ -0,0 +1,188 @@
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pygame
+
+# kinds of blocks that never change and are drawn once into the background
+STATIC_KINDS = ('wall', 'valid')
+
+# pictures shipped with the game
+HEAD_PICTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snakehead.png')
+FOOD_PICTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'apple.jpg')
+
+# counterclockwise rotation of the head picture (which faces up) for each moving direction
+HEAD_ROTATIONS = {(-1, 0): 0, (0, -1): 90, (1, 0): 180, (0, 1): 270}
+
+
+@lru_cache(maxsize=None)
+def load_sprite(path: str, block_length: int, background: Tuple[int, int, int], angle: int = 0) -> pygame.Surface:
+    """
+    Loads a picture, scales it to the block length, rotates it and flattens it onto the background color, so that
+    drawing it is a single opaque blit. Each combination is loaded and converted only once; the display mode must
+    be set before.
+
+    :param path: path of the picture
+    :param block_length: length of one block of the board in px
+    :param background: (R, G, B)-tuple of the empty fields, which shows through transparent parts of the picture
+    :param angle: counterclockwise rotation in degrees; multiple of 90
+    :return: surface of size block_length x block_length in the format of the display
+    """
+    picture = pygame.image.load(path).convert_alpha()
+    picture = pygame.transform.smoothscale(picture, (block_length, block_length))
+    picture = pygame.transform.rotate(picture, angle)
+    sprite = pygame.Surface((block_length, block_length))
+    sprite.fill(background)
+    sprite.blit(picture, (0, 0))
+    return sprite.convert()
+
+
+class BoardRenderer:
+    """
+    Draws the geometry matrix of the game on a display. Walls and empty fields are cached in a background surface;
+    after the first frame only the blocks that changed since the last frame are redrawn and updated on the display.
+
+    :ivar display: display to draw on
+    :ivar block_length: length of one block of the board in px
+    :ivar board_formatting: formatting of the different kinds of blocks
+    :ivar font: font of the score
+    :ivar background: surface with the walls and empty fields
+    :ivar last_matrix: geometry matrix of the last frame
+    :ivar sprites: pictures of the kinds of blocks that have one; the head is stored per moving direction
+    """
+
+    def __init__(self, display: pygame.Surface, block_length: int, board_formatting: Dict[str, dict],
+                 font: pygame.font.Font):
+        self.display = display
+        self.block_length = block_length
+        self.board_formatting = board_formatting
+        self.font = font
+        self.kinds = {formatting['code']: kind for kind, formatting in board_formatting.items()}
+        self.background: Optional[pygame.Surface] = None
+        self.last_matrix: Optional[np.ndarray] = None
+        self.last_score: Optional[int] = None
+        self.score_rect: Optional[pygame.Rect] = None
+        self.moving_direction = (-1, 0)
+        self.sprites: Dict[str, pygame.Surface] = {}
+        self.head_sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._load_sprites()
+
+    def _load_sprites(self) -> None:
+        """
+        Gets the pre-scaled pictures of all kinds of blocks with a picture and the rotated heads from the cache.
+        """
+        background = self.board_formatting['valid']['color']
+        for kind, formatting in self.board_formatting.items():
+            if formatting.get('picture') is None:
+                continue
+            if kind in STATIC_KINDS:
+                raise ValueError(f'Pictures are not supported for {kind} blocks.')
+            if kind == 'head':
+                self.head_sprites = {moving_direction: load_sprite(formatting['picture'], self.block_length,
+                                                                   background, angle)
+                                     for moving_direction, angle in HEAD_ROTATIONS.items()}
+            else:
+                self.sprites[kind] = load_sprite(formatting['picture'], self.block_length, background)
+
+    def render(self, geometry_matrix: np.array, current_score: int,
+               moving_direction: Tuple[int, int] = (0, 0)) -> None:
+        """
+        Draws the new frame and updates the changed parts of the display.
+
+        :param geometry_matrix: encoded board
+        :param current_score: score shown in the upper left corner
+        :param moving_direction: direction the head is facing; (0, 0) keeps the previous direction
+        """
+        turned = tuple(moving_direction) in HEAD_ROTATIONS and tuple(moving_direction) != self.moving_direction
+        if turned:
+            self.moving_direction = tuple(moving_direction)
+
+        if self.last_matrix is None or self.last_matrix.shape != geometry_matrix.shape:
+            self._render_full(geometry_matrix, current_score)
+            return
+
+        changed = geometry_matrix != self.last_matrix
+        if turned and self.head_sprites:
+            changed |= geometry_matrix == self.board_formatting['head']['code']
+        rows, cols = np.nonzero(changed)
+        dirty_rects = [self._draw_block(row, col, geometry_matrix[row, col]) for row, col in zip(rows, cols)]
+        np.copyto(self.last_matrix, geometry_matrix)
+
+        if current_score != self.last_score or self.score_rect.collidelist(dirty_rects) != -1:
+            dirty_rects.append(self._draw_score(geometry_matrix, current_score))
+
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
+    def _render_full(self, geometry_matrix: np.array, current_score: int) -> None:
+        """
+        Builds the background and draws the complete frame.
+        """
+        self.background = pygame.Surface(self.display.get_size())
+        self.background.fill(self.board_formatting['valid']['color'])
+        for row, col in np.argwhere(geometry_matrix == self.board_formatting['wall']['code']):
+            self.background.fill(self.board_formatting['wall']['color'], self._block_rect(row, col))
+        self.display.blit(self.background, (0, 0))
+
+        self.last_matrix = np.copy(geometry_matrix)
+        for row, col in self._dynamic_blocks(geometry_matrix):
+            self._draw_block(row, col, geometry_matrix[row, col])
+        self.score_rect = None
+        self._draw_score(geometry_matrix, current_score)
+        pygame.display.update()
+
+    def _dynamic_blocks(self, geometry_matrix: np.array) -> np.ndarray:
+        """
+        :return: coordinates of all blocks that are not part of the background
+        """
+        static = np.isin(geometry_matrix, [self.board_formatting[kind]['code'] for kind in STATIC_KINDS])
+        return np.argwhere(~static)
+
+    def _block_rect(self, row: int, col: int) -> pygame.Rect:
+        return pygame.Rect(col * self.block_length, row * self.block_length, self.block_length, self.block_length)
+
+    def _draw_block(self, row: int, col: int, code: int) -> pygame.Rect:
+        """
+        Draws a specific block on display.
+
+        :param row: row of the block
+        :param col: column of the block
+        :param code: code of the block in the geometry matrix
+        :return: rectangle of the block on the display
+        """
+        rectangle = self._block_rect(row, col)
+        kind = self.kinds[code]
+        if kind in STATIC_KINDS:
+            self.display.blit(self.background, rectangle, rectangle)
+        elif kind == 'head' and self.head_sprites:
+            self.display.blit(self.head_sprites[self.moving_direction], rectangle)
+        elif kind in self.sprites:
+            self.display.blit(self.sprites[kind], rectangle)
+        else:
+            self.display.fill(self.board_formatting[kind]['color'], rectangle)
+        return rectangle
+
+    def _draw_score(self, geometry_matrix: np.array, current_score: int) -> pygame.Rect:
+        """
+        Restores the blocks below the previous score and draws the new one.
+
+        :return: rectangle that has to be updated on the display
+        """
+        text = self.font.render(f'{current_score}', True, (0, 255, 255))
+        text_rect = text.get_rect(topleft=(25, 0))
+        dirty_rect = text_rect if self.score_rect is None else text_rect.union(self.score_rect)
+
+        if self.score_rect is not None:
+            self.display.blit(self.background, self.score_rect, self.score_rect)
+            first_row, first_col = self.score_rect.top // self.block_length, self.score_rect.left // self.block_length
+            last_row = (self.score_rect.bottom - 1) // self.block_length
+            last_col = (self.score_rect.right - 1) // self.block_length
+            area = geometry_matrix[first_row:last_row + 1, first_col:last_col + 1]
+            for row, col in self._dynamic_blocks(area):
+                self._draw_block(first_row + row, first_col + col, area[row, col])
+
+        self.display.blit(text, text_rect)
+        self.score_rect = text_rect
+        self.last_score = current_score
+        return dirty_rect
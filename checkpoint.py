@@ -0,0 +1,97 @@
+import os
+import random
+import shutil
+
+import torch
+
+from pytorch_player import PyTorchPlayer
+
+
+def save_checkpoint(player: PyTorchPlayer, path: str) -> None:
+    """
+    Atomically writes the complete training state of the player into the directory path: model, optimizer, target
+    model, counters, history, random states and the replay memory.
+    The checkpoint is written into a temporary directory first, which then replaces the previous checkpoint; if the
+    process dies while writing, the previous checkpoint stays intact. The previous checkpoint is only deleted after its
+    replacement was renamed into place.
+
+    :param player: player to save
+    :param path: directory of the checkpoint
+    """
+    temporary_path = f'{path}.tmp'
+    previous_path = f'{path}.old'
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+
+    state = {'model': player.model.state_dict(),
+             'optimizer': player.optimizer.state_dict(),
+             'target_model': None if player.target_model is None else player.target_model.state_dict(),
+             'counter_games': player.counter_games,
+             'counter_steps': player.counter_steps,
+             'counter_updates': player.counter_updates,
+             'history': player.history,
+             'python_random': random.getstate(),
+             'torch_random': torch.get_rng_state()}
+    torch.save(state, os.path.join(temporary_path, 'player.pt'))
+    player.memory.save(temporary_path)
+    for name in os.listdir(temporary_path):
+        with open(os.path.join(temporary_path, name), 'rb') as file:
+            os.fsync(file.fileno())
+    _fsync_directory(temporary_path)
+
+    if os.path.exists(path):
+        # path is the valid checkpoint, so a previous one left by a crash is outdated
+        shutil.rmtree(previous_path, ignore_errors=True)
+        os.rename(path, previous_path)
+    # otherwise the previous checkpoint (if any) is the only valid one until the new one is in place
+    os.rename(temporary_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+    shutil.rmtree(previous_path, ignore_errors=True)
+
+
+def _fsync_directory(path: str) -> None:
+    """
+    Makes the entries of a directory durable, e.g. after a rename. Windows neither supports nor needs this.
+
+    :param path: directory to synchronize
+    """
+    if os.name == 'nt':
+        return
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def load_checkpoint(player: PyTorchPlayer, path: str) -> None:
+    """
+    Restores the training state written by save_checkpoint into a player created with the same options. If the
+    process died while replacing the checkpoint, the previous checkpoint is used.
+
+    :param player: player to restore
+    :param path: directory of the checkpoint
+    """
+    if not os.path.exists(path) and os.path.exists(f'{path}.old'):
+        path = f'{path}.old'
+
+    state = torch.load(os.path.join(path, 'player.pt'), weights_only=False)
+    player.model.load_state_dict(state['model'])
+    player.optimizer.load_state_dict(state['optimizer'])
+    if player.target_model is not None and state['target_model'] is not None:
+        player.target_model.load_state_dict(state['target_model'])
+    player.counter_games = state['counter_games']
+    player.counter_steps = state['counter_steps']
+    player.counter_updates = state['counter_updates']
+    player.history = state['history']
+    random.setstate(state['python_random'])
+    torch.set_rng_state(state['torch_random'])
+    player.memory.load(path)
+
+
+def checkpoint_exists(path: str) -> bool:
+    """
+    :param path: directory of the checkpoint
+    :return: True if a checkpoint can be loaded from path
+    """
+    return os.path.exists(os.path.join(path, 'player.pt')) or os.path.exists(os.path.join(f'{path}.old', 'player.pt'))
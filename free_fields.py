@@ -0,0 +1,61 @@
+import random
+from typing import Tuple, Iterable, List, Dict
+
+
+class FreeFields:
+    """
+    Indexable set of the free fields of a board.
+    Fields are stored in a list with a map of their positions; removal swaps the last field into the gap, so adding,
+    removing and drawing a random field all run in constant time.
+
+    :ivar fields: list of the free (x, y) coordinates in arbitrary but deterministic order
+    :ivar positions: position of each free field in fields
+    """
+
+    def __init__(self, fields: Iterable[Tuple[int, int]]):
+        self.fields: List[Tuple[int, int]] = []
+        self.positions: Dict[Tuple[int, int], int] = {}
+        for field in fields:
+            self.add(field)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __contains__(self, field: Tuple[int, int]) -> bool:
+        return field in self.positions
+
+    def add(self, field: Tuple[int, int]) -> None:
+        """
+        Marks a field as free.
+
+        :param field: (x, y) coordinate of the field
+        """
+        if field not in self.positions:
+            self.positions[field] = len(self.fields)
+            self.fields.append(field)
+
+    def discard(self, field: Tuple[int, int]) -> None:
+        """
+        Marks a field as occupied; fields that are not free are ignored.
+
+        :param field: (x, y) coordinate of the field
+        """
+        position = self.positions.pop(field, None)
+        if position is None:
+            return
+
+        last = self.fields.pop()
+        if position < len(self.fields):
+            self.fields[position] = last
+            self.positions[last] = position
+
+    def choice(self, random_generator: random.Random) -> Tuple[int, int]:
+        """
+        Draws a uniformly distributed free field.
+
+        :param random_generator: random generator used for drawing
+        :return: (x, y) coordinate of the drawn field
+        """
+        if not self.fields:
+            raise IndexError('Cannot choose from a board without free fields')
+        return self.fields[random_generator.randrange(len(self.fields))]
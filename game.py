@@ -1,14 +1,27 @@
 import random
-from typing import Tuple
+import time
+from typing import Tuple, Optional, Union
 
 import numpy as np
 
 from board import Board
 from food import Apple
-from interaction_handler import InteractionHandler
+from free_fields import FreeFields
+from game_log import GameLog
+from interaction_handler import InteractionHandler, BoardEncodingDict, direction, default_encoding
+from profiling import Profiler, timed
 from snake import Snake
 
 
+def matrix_dtype(symbols: BoardEncodingDict) -> np.dtype:
+    """
+    :param symbols: encoding of the board elements
+    :return: smallest dtype of the occupying matrix that holds all codes
+    """
+    codes = symbols.values()
+    return np.dtype(np.uint8) if 0 <= min(codes) and max(codes) <= 255 else np.dtype(np.int64)
+
+
 class Game:
     """
     Model of the snake game.
@@ -21,87 +34,257 @@ class Game:
     :ivar board: instance of class board
     :ivar snake: instance of the snake
     :ivar food: instance of the food
+    :ivar verbose: if False, no messages are printed during the game
+    :ivar occupying_matrix: persistent encoding of the board; updated in place on each tick
+    :ivar done: True once the snake crashed; the game must be reset before the next step
+    :ivar log: record of the current game, from which it can be replayed (see replay); None if record is False
+    :ivar profiler: records the durations of the phases of run_game, ticks, games and apples; None to disable
     """
 
-    def __init__(self, board_dim: np.ndarray, snake_start: Tuple[int, int] = None, food_start: Tuple[int, int] = None, random_seed: int = 42):
-        self.game_score = 0
+    def __init__(self, board_dim: Union[np.ndarray, Board], snake_start: Tuple[int, int] = None, food_start: Tuple[int, int] = None, random_seed: int = 42,
+                 verbose: bool = True, record: bool = False, profiler: Optional[Profiler] = None):
+        self.verbose = verbose
+        self.profiler = profiler
         self.random = random.Random(random_seed)
-        self.board = Board(board_dim)
+        # a given Board is shared, e.g. by all games of a training run; only the dynamic state is allocated per game
+        self.board = board_dim if isinstance(board_dim, Board) else Board(board_dim)
+        self.board_dim = self.board.layout
+        self.log = GameLog(self.board_dim, random_seed, snake_start, food_start) if record else None
+        self.snake_start = snake_start
+        self.food_start = food_start
+        self.occupying_matrix = None
+        self._occupying_view = None
+        self._symbols = None
+
+        self._new_game()
 
-        if snake_start is None:
+    def _new_game(self) -> None:
+        """
+        Places snake and food on the empty board and resets the score.
+        """
+        self.game_score = 0
+        self.done = False
+        self.free_fields = FreeFields(tuple(coord) for coord in np.argwhere(self.board.board_matrix == 0).tolist())
+
+        if self.snake_start is None:
             self.snake = Snake([self.seed_element()])
         else:
-            self.snake = Snake([snake_start])
+            self.snake = Snake([self.snake_start])
+            self.free_fields.discard(self.snake_start)
 
-        if food_start is None:
+        if self.food_start is None:
             self.food = Apple(self.seed_element())
         else:
-            self.food = Apple(food_start)
+            self.food = Apple(self.food_start)
+            self.free_fields.discard(self.food_start)
 
+    @timed('food_spawn')
     def seed_element(self) -> Tuple[int, int]:
-        valid_fields = [tuple(coord) for coord in np.argwhere(self.board.board_matrix == 0).tolist()]
+        """
+        Draws a random field that is neither occupied by the snake nor by the food and marks it as occupied.
 
-        occupied_fields = []
-        if hasattr(self, 'snake'):
-            occupied_fields = occupied_fields+self.snake.body
-        if hasattr(self, 'food'):
-            occupied_fields = occupied_fields + [self.food.position]
+        :return: (x, y) coordinate of the drawn field
+        """
+        field = self.free_fields.choice(self.random)
+        self.free_fields.discard(field)
+        return field
 
-        free_fields = [item for item in valid_fields if item not in occupied_fields]
+    def reset(self, encoding: Optional[BoardEncodingDict] = None) -> np.array:
+        """
+        Starts a new game. The random generator is not reseeded, so consecutive games differ but stay reproducible.
 
-        return self.random.choice(free_fields)
+        :param encoding: encoding of the board elements; if None, the previous or the default encoding is used
+        :return: read-only view of the occupying matrix
+        """
+        if self.log is not None:
+            # a recorded game starts with a fresh seed drawn from the generator, so that it can be replayed on its own
+            random_seed = self.random.getrandbits(64)
+            self.random.seed(random_seed)
+            self.log = GameLog(self.board_dim, random_seed, self.snake_start, self.food_start)
+        self._new_game()
+        self.occupying_matrix = None
+        return self._get_occupying_matrix(encoding or self._symbols or default_encoding)
 
-    def run_game(self, interaction_handler: InteractionHandler) -> None:
+    def step(self, action: direction) -> Tuple[np.array, int, bool, dict]:
         """
-        Updates the current score using the discount function.
+        Propagates the game by one tick.
 
-        :return:
+        :param action: new moving direction of the snake as (x, y) or encoded action (see actions)
+        :return: observation (read-only view of the occupying matrix), reward (score gained in this tick),
+            done (True if the snake crashed) and info (score, food_score, moving_direction and cause of the crash)
+        :raises RuntimeError: if the game is over
         """
+        if self.done:
+            raise RuntimeError('The game is over; call reset() to start a new game.')
+        if self.occupying_matrix is None:
+            self._get_occupying_matrix(self._symbols or default_encoding)
+
         alive = True
         eaten = False
+        reward = 0
+        info = {}
+        self.snake.change_moving_direction(action)
+
+        # Get probable new position of snake (head) and check for validity
+        new_position = self.snake.get_propagated_head()
+        if self.board.check_border_collision(new_position):
+            alive = False
+            info['collision'] = 'wall'
+            self._log('Your snake touched the wall!')
+        if new_position == self.food.position:
+            eaten = True
+            self._log('Your snake has eaten.')
+
+        # Update all game elements
+        old_head, old_tail = self.snake.get_head(), self.snake.get_tail()
+        if not self.snake.update(eaten):
+            alive = False
+            info['collision'] = 'snake'
+            self._log('Your snake touched itself!')
+        self._move_snake_on_free_fields(old_tail, eaten)
+        if alive:
+            self._move_snake_on_matrix(old_head, old_tail, eaten)
+
+        if eaten:
+            reward = self.food.score
+            self.game_score += reward
+            if self.profiler is not None:
+                self.profiler.count('apples')
+            self.food = Apple(self.seed_element())
+            self._place_food_on_matrix()
+        else:
+            self.food.update()
+
+        info['score'] = self.game_score
+        info['food_score'] = self.food.get_score()
+        info['moving_direction'] = self.snake.get_moving_direction()
+        if self.log is not None:
+            self.log.append(self.snake.action)
+            self.log.final_score = self.game_score
+        self.done = not alive
+        return self._occupying_view, reward, not alive, info
+
+    def run_game(self, interaction_handler: InteractionHandler) -> None:
+        """
+        Plays the game until the snake crashes; the interaction handler receives the board on each tick and provides
+        the moving direction, and it is told by finish_game when the game is over.
+
+        :return:
+        """
+        occupying_matrix = self.get_occupying_matrix(interaction_handler)
+        done = False
+        profiler = self.profiler
 
-        while alive:
-            occupying_matrix = self.get_occupying_matrix(interaction_handler)
-            interaction_handler.push_board_status(occupying_matrix, self.snake.get_moving_direction(),
-                                                  self.game_score, self.food.get_score())
-            self.snake.change_moving_direction(interaction_handler.get_interaction())
-
-            # Get probable new position of snake (head) and check for validity
-            new_position = self.snake.get_propagated_head()
-            if self.board.check_border_collision(new_position):
-                alive = False
-                print('Your snake touched the wall!')
-            if new_position == self.food.position:
-                eaten = True
-                print('Your snake has eaten.')
-
-            # Update all game elements
-            if not self.snake.update(eaten):
-                alive = False
-                print('Your snake touched itself!')
-
-            if eaten:
-                self.game_score += self.food.score
-                self.food = Apple(self.seed_element())
-                occupying_matrix = self.get_occupying_matrix(interaction_handler)
-                eaten = False
+        while not done:
+            if profiler is None:
+                interaction_handler.push_board_status(occupying_matrix, self.snake.get_moving_direction(),
+                                                      self.game_score, self.food.get_score())
+                occupying_matrix, _, done, _ = self.step(interaction_handler.get_interaction())
             else:
-                self.food.update()
+                occupying_matrix, done = self._profiled_tick(interaction_handler, occupying_matrix)
 
         interaction_handler.push_board_status(occupying_matrix, self.snake.get_moving_direction(),
                                               self.game_score, self.food.get_score())
-        print(f'\nYour final score is {self.game_score}')
+        interaction_handler.finish_game()
+        self._log(f'\nYour final score is {self.game_score}')
+        if profiler is not None:
+            profiler.count('games')
+            profiler.maybe_dump()
+
+    def _profiled_tick(self, interaction_handler: InteractionHandler, occupying_matrix: np.array) \
+            -> Tuple[np.array, bool]:
+        """
+        One tick of run_game that records the durations of the handler callbacks and of the game step.
+
+        :return: observation and done of the step
+        """
+        profiler = self.profiler
+        start = time.perf_counter_ns()
+        interaction_handler.push_board_status(occupying_matrix, self.snake.get_moving_direction(),
+                                              self.game_score, self.food.get_score())
+        pushed = time.perf_counter_ns()
+        action = interaction_handler.get_interaction()
+        interacted = time.perf_counter_ns()
+        occupying_matrix, _, done, _ = self.step(action)
+        stepped = time.perf_counter_ns()
+
+        profiler.record('push_board_status', pushed - start)
+        profiler.record('get_interaction', interacted - pushed)
+        profiler.record('step', stepped - interacted)
+        profiler.record('tick', stepped - start)
+        profiler.count('ticks')
+        return occupying_matrix, done
+
+    def _log(self, message: str) -> None:
+        """
+        Prints a message about the game, unless the game is quiet.
+        """
+        if self.verbose:
+            print(message)
 
     def get_occupying_matrix(self, interaction_handler: InteractionHandler) -> np.array:
-        symbols = interaction_handler.get_encoding_dict()
-        occupying_matrix = np.copy(self.board.board_matrix)
+        """
+        Returns a read-only view of the encoded board. The matrix is built once per encoding and afterwards updated in
+        place, so the view always shows the current state of the game. Use np.copy to keep a snapshot.
 
-        occupying_matrix[occupying_matrix == 1] = symbols['wall']
-        occupying_matrix[occupying_matrix == 0] = symbols['valid']
+        :param interaction_handler: handler that defines the encoding of the board elements
+        :return: read-only view of the occupying matrix
+        """
+        return self._get_occupying_matrix(interaction_handler.get_encoding_dict())
+
+    def _get_occupying_matrix(self, symbols: BoardEncodingDict) -> np.array:
+        """
+        Returns a read-only view of the board encoded with symbols and rebuilds the matrix if the encoding changed.
+        """
+        if self.occupying_matrix is None or symbols != self._symbols:
+            self._symbols = dict(symbols)
+            self.occupying_matrix = self._build_occupying_matrix()
+            self._occupying_view = self.occupying_matrix.view()
+            self._occupying_view.flags.writeable = False
 
-        if self.snake.body[0:-1]:  # just print body of snake if there is one
-            occupying_matrix[tuple(np.array(self.snake.body[0:-1]).T)] = symbols['snake']
-        occupying_matrix[self.snake.body[-1]] = symbols['head']
+        return self._occupying_view
+
+    def _build_occupying_matrix(self) -> np.array:
+        """
+        Encodes the complete board from scratch.
+        """
+        symbols = self._symbols
+        occupying_matrix = np.full(self.board.board_matrix.shape, symbols['valid'], dtype=matrix_dtype(symbols))
+        occupying_matrix[self.board.board_matrix == 1] = symbols['wall']
+
+        body = self.snake.body
+        if body[0:-1]:  # just print body of snake if there is one
+            occupying_matrix[tuple(np.array(body[0:-1]).T)] = symbols['snake']
+        occupying_matrix[self.snake.get_head()] = symbols['head']
         occupying_matrix[self.food.position] = symbols['food']
 
         return occupying_matrix
+
+    def _move_snake_on_matrix(self, old_head: Tuple[int, int], old_tail: Tuple[int, int], eaten: bool) -> None:
+        """
+        Applies the propagation of the snake to the occupying matrix; only the old tail, the old head and the new head
+        change.
+        """
+        if self.occupying_matrix is None:
+            return
+
+        if not eaten:
+            self.occupying_matrix[old_tail] = self._symbols['valid']
+        if len(self.snake) > 1:
+            self.occupying_matrix[old_head] = self._symbols['snake']
+        self.occupying_matrix[self.snake.get_head()] = self._symbols['head']
+
+    def _move_snake_on_free_fields(self, old_tail: Tuple[int, int], eaten: bool) -> None:
+        """
+        Applies the propagation of the snake to the free fields; the old tail is released and the new head occupied.
+        """
+        if not eaten and not self.snake.occupies(old_tail) and self.board.board_matrix[old_tail] == 0:
+            self.free_fields.add(old_tail)
+        self.free_fields.discard(self.snake.get_head())
+
+    def _place_food_on_matrix(self) -> None:
+        """
+        Adds the current food to the occupying matrix.
+        """
+        if self.occupying_matrix is not None:
+            self.occupying_matrix[self.food.position] = self._symbols['food']
@@ -0,0 +1,154 @@
+import os
+import struct
+from typing import List, Tuple, Optional
+
+import numpy as np
+
+from actions import NONE
+
+# magic, version, rows, cols, seed, snake start, food start, standstill runs (version 1: idle ticks), moves, final
+# score
+HEADER = struct.Struct('<4sBHHQhhhhIIi')
+MAGIC = b'SNKL'
+VERSION = 2
+# number of moves before a standstill and number of its ticks; stored after the moves
+STANDSTILL_DTYPE = np.dtype([('moves', '<u4'), ('ticks', '<u4')])
+# bit offsets of the four moves in each byte of the packed move stream
+MOVE_SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+
+class GameLog:
+    """
+    Compact record of a game, from which the game can be reproduced exactly: the board layout, the seed of the random
+    generator, the start fields and the moves of the snake. On disk the walls take one bit per field and the moves two
+    bits per tick.
+    Only the effective moves are recorded (reversals are ignored by the snake anyway). The snake may stand still, e.g.
+    before its first move; consecutive ticks of standstill are stored as one run of eight bytes.
+
+    :ivar board_dim: matrix of the playing field; 0 = valid; 1 = invalid
+    :ivar random_seed: seed of the game's random generator
+    :ivar snake_start: (x, y) start of the snake; None if it was drawn randomly
+    :ivar food_start: (x, y) start of the food; None if it was drawn randomly
+    :ivar standstills: runs of standstill as [number of moves before the run, ticks of the run]
+    :ivar final_score: score of the game, for checking the replay
+    """
+
+    def __init__(self, board_dim: np.ndarray, random_seed: int, snake_start: Optional[Tuple[int, int]] = None,
+                 food_start: Optional[Tuple[int, int]] = None):
+        if not 0 <= random_seed < 2 ** 64:
+            raise ValueError('Only seeds in [0, 2**64) can be logged.')
+        self.board_dim = np.asarray(board_dim)
+        self.random_seed = random_seed
+        self.snake_start = snake_start
+        self.food_start = food_start
+        self.standstills: List[List[int]] = []
+        self.final_score = 0
+        self._moves = bytearray()
+
+    def __len__(self) -> int:
+        """
+        :return: number of ticks of the game
+        """
+        return len(self._moves) + sum(ticks for _, ticks in self.standstills)
+
+    @property
+    def idle_ticks(self) -> int:
+        """
+        :return: ticks before the snake's first move
+        """
+        if self.standstills and self.standstills[0][0] == 0:
+            return self.standstills[0][1]
+        return 0
+
+    def append(self, action: int) -> None:
+        """
+        Records the moving direction of the snake after a tick.
+
+        :param action: encoded moving direction (see actions)
+        """
+        if action != NONE:
+            self._moves.append(action)
+        elif self.standstills and self.standstills[-1][0] == len(self._moves):
+            self.standstills[-1][1] += 1
+        else:
+            self.standstills.append([len(self._moves), 1])
+
+    def actions(self) -> np.ndarray:
+        """
+        :return: actions of all ticks
+        """
+        moves = np.frombuffer(self._moves, dtype=np.int8)
+        if not self.standstills:
+            return moves.copy()
+        positions, ticks = np.array(self.standstills, dtype=np.int64).T
+        return np.insert(moves, np.repeat(positions, ticks), NONE)
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: binary representation of the log
+        """
+        rows, cols = self.board_dim.shape
+        snake_start = (-1, -1) if self.snake_start is None else self.snake_start
+        food_start = (-1, -1) if self.food_start is None else self.food_start
+        header = HEADER.pack(MAGIC, VERSION, rows, cols, self.random_seed, *snake_start, *food_start,
+                             len(self.standstills), len(self._moves), self.final_score)
+
+        moves = np.frombuffer(self._moves, dtype=np.uint8)
+        moves = np.concatenate((moves, np.zeros(-len(moves) % 4, dtype=np.uint8))).reshape(-1, 4)
+        packed_moves = np.bitwise_or.reduce(moves << MOVE_SHIFTS, axis=1).astype(np.uint8)
+        walls = np.packbits(self.board_dim != 0)
+        standstills = np.array([tuple(run) for run in self.standstills], dtype=STANDSTILL_DTYPE)
+        return header + walls.tobytes() + packed_moves.tobytes() + standstills.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'GameLog':
+        """
+        :param data: binary representation written by to_bytes
+        :return: restored log
+        """
+        magic, version, rows, cols, random_seed, snake_x, snake_y, food_x, food_y, n_standstills, n_moves, \
+            final_score = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError('Data is no game log of a supported version.')
+
+        offset = HEADER.size
+        n_wall_bytes = (rows * cols + 7) // 8
+        walls = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=n_wall_bytes, offset=offset),
+                              count=rows * cols)
+        offset += n_wall_bytes
+        packed_moves = np.frombuffer(data, dtype=np.uint8, count=(n_moves + 3) // 4, offset=offset)
+        moves = ((packed_moves[:, None] >> MOVE_SHIFTS) & 3).reshape(-1)[:n_moves]
+        offset += len(packed_moves)
+        if version == 1:
+            # version 1 only stored the idle ticks before the first move
+            standstills = [[0, n_standstills]] if n_standstills else []
+        else:
+            standstills = np.frombuffer(data, dtype=STANDSTILL_DTYPE, count=n_standstills, offset=offset)
+            standstills = [[int(position), int(ticks)] for position, ticks in standstills]
+
+        log = cls(walls.reshape(rows, cols).astype(int), random_seed,
+                  None if snake_x < 0 else (snake_x, snake_y), None if food_x < 0 else (food_x, food_y))
+        log.standstills = standstills
+        log.final_score = final_score
+        log._moves = bytearray(moves.astype(np.uint8).tobytes())
+        return log
+
+    def save(self, path: str) -> None:
+        """
+        Atomically writes the log to path.
+
+        :param path: path of the file
+        """
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(self.to_bytes())
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'GameLog':
+        """
+        :param path: path of a file written by save
+        :return: restored log
+        """
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
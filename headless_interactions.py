@@ -0,0 +1,38 @@
+from typing import Tuple, Optional
+
+import numpy as np
+
+from interaction_handler import InteractionHandler, BoardEncodingDict, direction, default_encoding
+from player import Player
+
+
+class HeadlessInteractionHandler(InteractionHandler):
+    """
+    Implements interaction with an AI without displaying the game; does not need pygame.
+    """
+
+    def __init__(self, player: Player, encoding: Optional[BoardEncodingDict] = None):
+        """
+        :param player: AI that plays the game
+        :param encoding: encoding of the board elements; if no encoding is given, the codes of the pygame handlers
+            are used
+        """
+        self.player = player
+        self.encoding = dict(default_encoding if encoding is None else encoding)
+
+    def get_encoding_dict(self) -> BoardEncodingDict:
+        """Returns the encoding for different board elements."""
+        return self.encoding
+
+    def push_board_status(self, geometry_matrix: np.array, moving_direction: Tuple[int, int], current_score: int,
+                          food_score: int) -> None:
+        """
+        Forwards the updated board to the player.
+        """
+        self.player.push_board_status(geometry_matrix, moving_direction, current_score, food_score)
+
+    def get_interaction(self) -> direction:
+        """
+        Returns the player's moving direction for the next snake
+        """
+        return self.player.get_response()
@@ -15,6 +15,9 @@ class BoardEncodingDict(TypedDict):
 
 direction = Literal[(0, 1), (1, 0), (0, -1), (-1, 0)]
 
+# encoding used by the pygame handlers; default for games without a handler
+default_encoding: BoardEncodingDict = {'head': 101, 'wall': 1, 'valid': 0, 'snake': 100, 'food': 200}
+
 
 class InteractionHandler:
     """
@@ -30,5 +33,12 @@ class InteractionHandler:
         pass
 
     def get_interaction(self) -> direction:
-        """Waits for player's input and returns the moving direction for the next snake"""
+        """
+        Waits for player's input and returns the moving direction for the next snake; either as (x, y) or as encoded
+        action (see actions)
+        """
+        pass
+
+    def finish_game(self) -> None:
+        """Shows the final board after the last push_board_status of a game."""
         pass
@@ -1,18 +1,19 @@
+import argparse
+
 import numpy as np
 
+from board import edge_mask, load_level
 from game import Game
 from pygame_interactions import PygameInteractions
 import pygame
 import random
 
 
-def edge_mask(x: np.ndarray):
-    mask = np.ones(x.shape, dtype=bool)
-    mask[x.ndim * (slice(1, -1),)] = False
-    return mask
-
-
 def main():
+    parser = argparse.ArgumentParser(description='Play snake.')
+    parser.add_argument('--level', default=None, help='level file, e.g. levels/rooms.txt; default: an empty box')
+    args = parser.parse_args()
+
     # Define board
     width = 8
     height = 5
@@ -20,6 +21,8 @@ def main():
 
     dummy = np.zeros((height+2, width+2), dtype=int)
     dummy[edge_mask(dummy)] = 1
+    if args.level is not None:
+        dummy = load_level(args.level).layout
 
     pygame.init()
     pygame.font.init()
@@ -28,12 +31,15 @@ def main():
 
     interactor = PygameInteractions(display=display, block_length=block_size, ticks_per_second=5)
 
-    snake_start_pos = (3, 3)
-    valid_pos = [tuple(coord) for coord in np.argwhere(dummy == 0).tolist()]
-    valid_pos.remove(snake_start_pos)
-    food_start_pos = valid_pos[random.randint(0, len(valid_pos) - 1)]
-
-    game = Game(dummy, snake_start_pos, food_start_pos, 42)
+    if args.level is None:
+        snake_start_pos = (3, 3)
+        valid_pos = [tuple(coord) for coord in np.argwhere(dummy == 0).tolist()]
+        valid_pos.remove(snake_start_pos)
+        food_start_pos = valid_pos[random.randint(0, len(valid_pos) - 1)]
+        game = Game(dummy, snake_start_pos, food_start_pos, 42)
+    else:
+        # snake and food are placed on random free fields of the level
+        game = Game(load_level(args.level), random_seed=42)
 
     game.run_game(interactor)
 
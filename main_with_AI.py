@@ -1,46 +1,105 @@
+import argparse
+import os
 import time
 
 import numpy as np
-import pygame
 
+from board import Board, load_level
+from checkpoint import save_checkpoint, load_checkpoint, checkpoint_exists
 from game import Game
-from pytorch_interactions import PyGamePyTorchInteractionHandler
+from headless_interactions import HeadlessInteractionHandler
+from profiling import Profiler
 from pytorch_player import PyTorchPlayer
 
 block_size = 25
+show_game = False  # if False, the game runs headless without pygame and without printing each event
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Train the snake AI.')
+    parser.add_argument('--checkpoint', default='checkpoints/snake_ai', help='directory of the checkpoint')
+    parser.add_argument('--checkpoint-interval', type=int, default=100, help='games between checkpoints; 0 = never')
+    parser.add_argument('--resume', action='store_true', help='continue training from the checkpoint')
+    parser.add_argument('--metrics', default='checkpoints/metrics.npy',
+                        help='file the game metrics are dumped to with each checkpoint')
+    parser.add_argument('--no-plot', action='store_true', help='do not plot the scores')
+    parser.add_argument('--observation', choices=('features', 'board'), default='features',
+                        help='state of the AI: 12 features or stacked planes of the whole board for a CNN')
+    parser.add_argument('--frames', type=int, default=2, help='number of stacked frames of the board observation')
+    parser.add_argument('--memory-capacity', type=int, default=100000, help='number of transitions in the memory')
+    parser.add_argument('--level', default=None, help='level file, e.g. levels/rooms.txt; default: an empty field')
+    parser.add_argument('--game-logs', default=None,
+                        help='directory each game is logged to; replay a game with replay.py')
+    parser.add_argument('--profile', default=None,
+                        help='file the phase timings and counters are written to in the Prometheus text format')
+    parser.add_argument('--profile-port', type=int, default=None,
+                        help='port of an HTTP endpoint serving the phase timings and counters for Prometheus')
+    args = parser.parse_args()
+    profiler = None
+    if args.profile is not None or args.profile_port is not None:
+        profiler = Profiler(path=args.profile)
+        if args.profile_port is not None:
+            profiler.serve(args.profile_port)
+    if args.game_logs is not None:
+        os.makedirs(args.game_logs, exist_ok=True)
+
     # Define board
     width = 25
     height = 20
-    board = np.zeros((height+2, width+2), dtype=int)
+    if args.level is None:
+        board = Board(np.zeros((height+2, width+2), dtype=int))  # shared by all games
+    else:
+        board = load_level(args.level)
+
+    if show_game:
+        # init pygame display
+        import pygame
+        from pytorch_interactions import PyGamePyTorchInteractionHandler
 
-    # init pygame display
-    pygame.init()
-    pygame.font.init()
-    pygame.display.set_caption('Snake AI (By Jonathan & Florian)')
+        pygame.init()
+        pygame.font.init()
+        pygame.display.set_caption('Snake AI (By Jonathan & Florian)')
 
     # set up player
-    ai_player = PyTorchPlayer()
+    board_shape = board.board_matrix.shape if args.observation == 'board' else None
+    ai_player = PyTorchPlayer(plot=not args.no_plot, memory_capacity=args.memory_capacity, board_shape=board_shape,
+                              n_frames=args.frames, profiler=profiler)
 
     total_score = 0
     record = 0
-    while True:
-        game = Game(board_dim=board, random_seed=time.time_ns())
-        #display = pygame.display.set_mode([game.board.board_matrix.shape[1] * block_size, game.board.board_matrix.shape[0] * block_size])
-        #interacter = PyGamePyTorchInteractionHandler(player=ai_player, display=display, block_length=block_size, ticks_per_second=100)
-        interacter = PyGamePyTorchInteractionHandler(player=ai_player)
-        ai_player.encoding = interacter.get_encoding_dict()
-        ai_player.new_round()
-        game.run_game(interacter)
-        ai_player.closing_action(game.game_score)
-
-        total_score += game.game_score
-        if game.game_score > record:
-            record = game.game_score
-        print('Game:', ai_player.counter_games, '\tScore:', game.game_score, '\tTurns:', ai_player.counter_move)
-        print('Record:\t\t\t', record)
+    if args.resume and checkpoint_exists(args.checkpoint):
+        load_checkpoint(ai_player, args.checkpoint)
+        total_score = int(ai_player.history.scores.sum())
+        record = int(ai_player.history.scores.max(initial=0))
+        print('Resumed at game', ai_player.counter_games)
+
+    try:
+        while True:
+            game = Game(board_dim=board, random_seed=time.time_ns(), verbose=show_game, record=args.game_logs is not None,
+                        profiler=profiler)
+            if show_game:
+                display = pygame.display.set_mode([game.board.board_matrix.shape[1] * block_size, game.board.board_matrix.shape[0] * block_size])
+                interacter = PyGamePyTorchInteractionHandler(player=ai_player, display=display, block_length=block_size, ticks_per_second=100)
+            else:
+                interacter = HeadlessInteractionHandler(player=ai_player)
+            ai_player.encoding = interacter.get_encoding_dict()
+            ai_player.new_round()
+            game.run_game(interacter)
+            ai_player.closing_action(game.game_score)
+            if game.log is not None:
+                game.log.save(os.path.join(args.game_logs, f'game_{ai_player.counter_games:06d}.snk'))
+
+            total_score += game.game_score
+            if game.game_score > record:
+                record = game.game_score
+            print('Game:', ai_player.counter_games, '\tScore:', game.game_score, '\tTurns:', ai_player.counter_move)
+            print('Record:\t\t\t', record)
+
+            if args.checkpoint_interval and ai_player.counter_games % args.checkpoint_interval == 0:
+                save_checkpoint(ai_player, args.checkpoint)
+                ai_player.history.dump(args.metrics)
+    finally:
+        ai_player.close()
 
 
 if __name__ == "__main__":
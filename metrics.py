@@ -0,0 +1,128 @@
+import multiprocessing as mp
+import os
+import queue
+from typing import List, Tuple
+
+import numpy as np
+
+
+class MetricsLog:
+    """
+    Append-only log of the finished games in growing numpy arrays; appending is amortized O(1).
+
+    :ivar games: number of the game
+    :ivar scores: final score of the game
+    :ivar moves: number of moves of the game
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.zeros((capacity, 3), dtype=np.int64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, game: int, score: int, moves: int) -> None:
+        """
+        Logs a finished game.
+        """
+        if self._size == len(self._data):
+            self._data = np.concatenate((self._data, np.zeros_like(self._data)))
+        self._data[self._size] = game, score, moves
+        self._size += 1
+
+    @property
+    def games(self) -> np.ndarray:
+        return self._data[:self._size, 0]
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self._data[:self._size, 1]
+
+    @property
+    def moves(self) -> np.ndarray:
+        return self._data[:self._size, 2]
+
+    def dump(self, path: str) -> None:
+        """
+        Atomically writes the log as .npy file with the columns game, score and moves, e.g. for a dashboard.
+
+        :param path: path of the file
+        """
+        temporary_path = f'{path}.tmp.npy'
+        np.save(temporary_path, self._data[:self._size])
+        os.replace(temporary_path, path)
+
+
+def run_plot(points: mp.Queue) -> None:
+    """
+    Plot process: shows the scores received from the training process until None is received.
+
+    :param points: queue of lists of (game, score) tuples
+    """
+    import matplotlib.pyplot as plt
+
+    figure, ax = plt.subplots()
+    lines, = ax.plot([], [], 'o')
+    # Autoscale on unknown axis and known lims on the other
+    ax.set_autoscaley_on(True)
+    ax.grid()
+    games, scores = [], []
+
+    while True:
+        try:
+            batch = points.get(timeout=0.5)
+        except queue.Empty:
+            plt.pause(0.1)
+            continue
+        if batch is None:
+            break
+        for game, score in batch:
+            games.append(game)
+            scores.append(score)
+
+        lines.set_data(games, scores)
+        # Need both of these in order to rescale
+        ax.relim()
+        ax.autoscale_view()
+        figure.canvas.draw_idle()
+        plt.pause(0.01)
+    plt.close(figure)
+
+
+class LivePlot:
+    """
+    Plots the scores in a separate process. Sending never blocks: if the plot process falls behind, points are kept
+    and sent together with the next ones.
+    """
+
+    def __init__(self):
+        context = mp.get_context('spawn')
+        self.points = context.Queue(maxsize=16)
+        self.pending: List[Tuple[int, int]] = []
+        self.process = context.Process(target=run_plot, args=(self.points,), daemon=True)
+        self.process.start()
+
+    def push(self, game: int, score: int) -> None:
+        """
+        Adds a point to the plot.
+        """
+        self.pending.append((game, score))
+        try:
+            self.points.put_nowait(self.pending)
+            self.pending = []
+        except queue.Full:
+            pass
+
+    def close(self) -> None:
+        """
+        Stops the plot process and waits until it exited.
+        """
+        try:
+            self.points.put_nowait(None)
+        except queue.Full:
+            self.process.terminate()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
@@ -31,19 +31,20 @@ class Linear_QNet(nn.Module):
 
 class QNet(nn.Module):
 
-    def __init__(self, h, w, outputs):
+    def __init__(self, h, w, outputs, in_channels=2, padding=0):
+        # padding=2 keeps small boards (e.g. 22 x 27) from shrinking below the kernel size
         super(QNet, self).__init__()
-        self.conv1 = nn.Conv2d(2, 16, kernel_size=5, stride=2)
+        self.conv1 = nn.Conv2d(in_channels, 16, kernel_size=5, stride=2, padding=padding)
         self.bn1 = nn.BatchNorm2d(16)
-        self.conv2 = nn.Conv2d(16, 32, kernel_size=5, stride=2)
+        self.conv2 = nn.Conv2d(16, 32, kernel_size=5, stride=2, padding=padding)
         self.bn2 = nn.BatchNorm2d(32)
-        self.conv3 = nn.Conv2d(32, 32, kernel_size=5, stride=2)
+        self.conv3 = nn.Conv2d(32, 32, kernel_size=5, stride=2, padding=padding)
         self.bn3 = nn.BatchNorm2d(32)
 
         # Number of Linear input connections depends on output of conv2d layers
         # and therefore the input image size, so compute it.
         def conv2d_size_out(size, kernel_size = 5, stride = 2):
-            return (size - (kernel_size - 1) - 1) // stride  + 1
+            return (size + 2 * padding - (kernel_size - 1) - 1) // stride  + 1
         convw = conv2d_size_out(conv2d_size_out(conv2d_size_out(w)))
         convh = conv2d_size_out(conv2d_size_out(conv2d_size_out(h)))
         linear_input_size = convw * convh * 32
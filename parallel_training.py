@@ -0,0 +1,220 @@
+import argparse
+import copy
+import queue
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+
+from actions import ACTION_DTYPE
+from game import Game
+from headless_interactions import HeadlessInteractionHandler
+from pytorch_player import PyTorchPlayer
+
+Transitions = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+class ActorPlayer(PyTorchPlayer):
+    """
+    PyTorchPlayer that only acts. Transitions are collected for a learner process instead of training on them.
+    """
+
+    def __init__(self):
+        super().__init__(plot=False, memory_capacity=1)
+        self.transitions = []
+
+    def train_short_memory(self, state, action, reward, next_state, done) -> None:
+        """Training is done by the learner."""
+        pass
+
+    def remember(self, state, action, reward, next_state, done) -> None:
+        self.transitions.append((state.copy(), action, reward, next_state.copy(), done))
+
+    def closing_action(self, score: int) -> None:
+        """
+        Remember the final transition of the game; training and plotting are done by the learner.
+
+        :param score:
+        :return:
+        """
+        self.get_state_vector()
+        self.remember(self.previous_status['predictor_vector'], self.previous_status['prediction'], -30, self.new_status['predictor_vector'], True)
+
+    def pop_transitions(self) -> Transitions:
+        """
+        :return: transitions of the last game as stacked arrays (state, action, reward, next_state, done)
+        """
+        state, action, reward, next_state, done = zip(*self.transitions)
+        self.transitions = []
+        return np.stack(state), np.array(action, dtype=ACTION_DTYPE), np.array(reward), np.stack(next_state), np.array(done)
+
+
+def run_actor(worker_id: int, board: np.ndarray, transition_queue: mp.Queue, shared_model: nn.Module,
+              weights_version: mp.Value, weights_lock: mp.Lock, games_counter: mp.Value, stop_event: mp.Event,
+              seed: int) -> None:
+    """
+    Worker process: plays games with the latest broadcast weights and sends the transitions of each game to the learner.
+
+    :param worker_id: index of the worker
+    :param board: matrix of the playing field; 0 = valid; 1 = invalid
+    :param transition_queue: queue the transitions of each finished game are put into
+    :param shared_model: model in shared memory holding the broadcast weights
+    :param weights_version: incremented by the learner on each broadcast
+    :param weights_lock: lock guarding shared_model
+    :param games_counter: number of games the learner has trained on; used for the exploration schedule
+    :param stop_event: set by the learner to stop the worker
+    :param seed: seed of the worker's random generators
+    """
+    torch.set_num_threads(1)
+    random.seed(seed)
+    game_seeds = random.Random(seed)
+    player = ActorPlayer()
+    version = -1
+
+    while not stop_event.is_set():
+        if weights_version.value != version:
+            with weights_lock:
+                player.model.load_state_dict(shared_model.state_dict())
+                version = weights_version.value
+        player.counter_games = games_counter.value
+
+        game = Game(board_dim=board, random_seed=game_seeds.getrandbits(64), verbose=False)
+        interacter = HeadlessInteractionHandler(player=player)
+        player.encoding = interacter.get_encoding_dict()
+        player.new_round()
+        with torch.no_grad():
+            game.run_game(interacter)
+        player.closing_action(game.game_score)
+
+        transition_queue.put((worker_id, game.game_score, player.counter_move, player.pop_transitions()))
+
+
+def learn_from_game(learner: PyTorchPlayer, score: int, moves: int, transitions: Transitions) -> None:
+    """
+    Adds the transitions of a game played by an actor to the learner's memory and trains on the memory.
+
+    :param learner: player that is trained
+    :param score: final score of the game
+    :param moves: number of moves of the game
+    :param transitions: stacked transitions of the game
+    """
+    state, action, reward, next_state, done = transitions
+    learner.memory.extend(state, action, reward, next_state, done)
+    learner.counter_move = moves
+    learner.train_long_memory(learner.memory)
+    learner.record_game(score)
+
+
+def broadcast_weights(learner: PyTorchPlayer, shared_model: nn.Module, weights_version: mp.Value,
+                      weights_lock: mp.Lock) -> None:
+    """
+    Copies the learner's weights into the shared model and notifies the actors.
+    """
+    with weights_lock, torch.no_grad():
+        for shared, trained in zip(shared_model.parameters(), learner.model.parameters()):
+            shared.copy_(trained)
+        weights_version.value += 1
+
+
+def receive_game(transition_queue: mp.Queue, workers: List[mp.Process], timeout: float = 1.0) \
+        -> Tuple[int, int, int, Transitions]:
+    """
+    Waits for the next game finished by an actor. The actors are checked while waiting, so that the learner does not
+    block forever on a crashed actor.
+
+    :param transition_queue: queue the actors put their finished games into
+    :param workers: actor processes
+    :param timeout: seconds between the checks of the actors
+    :return: worker id, score, number of moves and transitions of the game
+    :raises RuntimeError: if an actor exited
+    """
+    while True:
+        for worker in workers:
+            if not worker.is_alive():
+                raise RuntimeError(f'Actor {worker.name} exited with code {worker.exitcode}.')
+        try:
+            return transition_queue.get(timeout=timeout)
+        except queue.Empty:
+            pass
+
+
+def train_parallel(board: np.ndarray, n_workers: int, sync_interval: int = 10, n_games: int = None,
+                   seed: int = 0, plot: bool = True) -> PyTorchPlayer:
+    """
+    Trains a PyTorchPlayer with n_workers actor processes playing in parallel and this process as learner.
+
+    :param board: matrix of the playing field; 0 = valid; 1 = invalid
+    :param n_workers: number of actor processes
+    :param sync_interval: number of games after which the learner broadcasts its weights
+    :param n_games: number of games to train on; if None, training runs until it is interrupted
+    :param seed: base seed of the actors
+    :param plot: whether the learner plots the scores during the training
+    :return: trained player
+    """
+    context = mp.get_context('spawn')
+    learner = PyTorchPlayer(plot=plot)
+    shared_model = copy.deepcopy(learner.model)
+    shared_model.share_memory()
+
+    weights_version = context.Value('i', 0)
+    weights_lock = context.Lock()
+    games_counter = context.Value('i', 0)
+    stop_event = context.Event()
+    transition_queue = context.Queue(maxsize=4 * n_workers)
+
+    workers: List[mp.Process] = [
+        context.Process(target=run_actor, daemon=True,
+                        args=(worker_id, board, transition_queue, shared_model, weights_version, weights_lock,
+                              games_counter, stop_event, seed + worker_id))
+        for worker_id in range(n_workers)]
+    for worker in workers:
+        worker.start()
+
+    record = 0
+    try:
+        while n_games is None or learner.counter_games < n_games:
+            worker_id, score, moves, transitions = receive_game(transition_queue, workers)
+            learn_from_game(learner, score, moves, transitions)
+            games_counter.value = learner.counter_games
+            if learner.counter_games % sync_interval == 0:
+                broadcast_weights(learner, shared_model, weights_version, weights_lock)
+
+            record = max(record, score)
+            print('Game:', learner.counter_games, '\tWorker:', worker_id, '\tScore:', score, '\tTurns:', moves)
+            print('Record:\t\t\t', record)
+    finally:
+        stop_event.set()
+        # drain the queue, so that no worker blocks on a full queue
+        while any(worker.is_alive() for worker in workers):
+            try:
+                transition_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for worker in workers:
+            worker.join()
+        learner.close()
+
+    return learner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the snake AI with parallel self-play workers.')
+    parser.add_argument('--workers', type=int, default=mp.cpu_count() - 1, help='number of actor processes')
+    parser.add_argument('--sync-interval', type=int, default=10, help='games between weight broadcasts')
+    parser.add_argument('--games', type=int, default=None, help='number of games to train on')
+    args = parser.parse_args()
+
+    # Define board
+    width = 25
+    height = 20
+    board = np.zeros((height+2, width+2), dtype=int)
+
+    train_parallel(board, max(args.workers, 1), args.sync_interval, args.games, seed=time.time_ns() % 2**32)
+
+
+if __name__ == "__main__":
+    main()
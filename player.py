@@ -13,5 +13,5 @@ class Player:
         pass
 
     def get_response(self) -> Tuple[int, int]:
-        """Return new moving direction."""
+        """Return new moving direction as (x, y) or as encoded action (see actions)."""
         pass
@@ -0,0 +1,168 @@
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+# bucket i of a histogram counts durations below 2 ** (i + SMALLEST_BUCKET) ns; the last bucket is unbounded
+SMALLEST_BUCKET = 8
+N_BUCKETS = 32
+PREFIX = 'snake'
+
+
+class Histogram:
+    """
+    Histogram of durations with logarithmic buckets (powers of two in ns). Recording a value costs one bit_length and
+    one list increment.
+
+    :ivar counts: number of durations in each bucket
+    :ivar total: sum of the durations in ns
+    :ivar count: number of durations
+    """
+
+    def __init__(self):
+        self.counts: List[int] = [0] * N_BUCKETS
+        self.total = 0
+        self.count = 0
+
+    def record(self, duration: int) -> None:
+        """
+        :param duration: duration in ns
+        """
+        self.counts[min(max(duration.bit_length() - SMALLEST_BUCKET, 0), N_BUCKETS - 1)] += 1
+        self.total += duration
+        self.count += 1
+
+
+class Profiler:
+    """
+    Collects timings of the phases of a game and of the player, counters (e.g. ticks, games, apples, SGD steps) and
+    gauges (e.g. replay size). The profiler is optional everywhere: without it, the instrumented code only checks for
+    None.
+    The measurements are exported in the Prometheus text format, into a file (see dump and maybe_dump) or by an HTTP
+    endpoint (see serve).
+
+    :ivar histograms: durations of each phase
+    :ivar counters: monotonically increasing counts
+    :ivar gauges: last value of each gauge
+    :ivar path: file the measurements are dumped to by maybe_dump
+    :ivar interval: minimal time between two dumps of maybe_dump in s
+    """
+
+    def __init__(self, path: Optional[str] = None, interval: float = 10.0):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, float] = {}
+        self.path = path
+        self.interval = interval
+        self.last_dump = time.monotonic()
+
+    def record(self, phase: str, duration: int) -> None:
+        """
+        :param phase: name of the phase
+        :param duration: duration of the phase in ns
+        """
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = Histogram()
+        histogram.record(duration)
+
+    def count(self, counter: str, n: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def set_gauge(self, gauge: str, value: float) -> None:
+        self.gauges[gauge] = value
+
+    def export(self) -> str:
+        """
+        :return: measurements in the Prometheus text format
+        """
+        lines = []
+        histograms = list(self.histograms.items())
+        if histograms:
+            lines.append(f'# TYPE {PREFIX}_phase_seconds histogram')
+        for phase, histogram in histograms:
+            counts, total, count = list(histogram.counts), histogram.total, histogram.count
+            cumulative = 0
+            for bucket, bucket_count in enumerate(counts[:-1]):
+                cumulative += bucket_count
+                upper_bound = 2 ** (bucket + SMALLEST_BUCKET) * 1e-9
+                lines.append(f'{PREFIX}_phase_seconds_bucket{{phase="{phase}",le="{upper_bound:.9g}"}} {cumulative}')
+            lines.append(f'{PREFIX}_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {count}')
+            lines.append(f'{PREFIX}_phase_seconds_sum{{phase="{phase}"}} {total * 1e-9:.9g}')
+            lines.append(f'{PREFIX}_phase_seconds_count{{phase="{phase}"}} {count}')
+        for counter, value in list(self.counters.items()):
+            lines.append(f'# TYPE {PREFIX}_{counter}_total counter')
+            lines.append(f'{PREFIX}_{counter}_total {value}')
+        for gauge, value in list(self.gauges.items()):
+            lines.append(f'# TYPE {PREFIX}_{gauge} gauge')
+            lines.append(f'{PREFIX}_{gauge} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """
+        Atomically writes the measurements, e.g. for the textfile collector of the Prometheus node exporter.
+
+        :param path: path of the file; if None, self.path is used
+        """
+        path = path or self.path
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'w') as file:
+            file.write(self.export())
+        os.replace(temporary_path, path)
+        self.last_dump = time.monotonic()
+
+    def maybe_dump(self) -> None:
+        """
+        Dumps the measurements to self.path if it is set and the last dump is older than self.interval.
+        """
+        if self.path is not None and time.monotonic() - self.last_dump >= self.interval:
+            self.dump()
+
+    def serve(self, port: int, host: str = '') -> ThreadingHTTPServer:
+        """
+        Serves the measurements from a daemon thread for Prometheus to scrape.
+
+        :param port: port of the endpoint; 0 chooses a free port
+        :param host: interface of the endpoint
+        :return: server; server.server_address contains the port and server.shutdown() stops it
+        """
+        profiler = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = profiler.export().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def timed(phase: str) -> Callable:
+    """
+    Decorator that records the duration of a method in self.profiler, unless self.profiler is None.
+
+    :param phase: name of the phase
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                profiler.record(phase, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
@@ -1,6 +1,10 @@
+from collections import deque
+
 import pygame
 import numpy as np
+from board_renderer import BoardRenderer, HEAD_PICTURE, FOOD_PICTURE
 from interaction_handler import InteractionHandler, BoardEncodingDict, direction
+from rate_limiter import RateLimiter
 from typing import Dict, Tuple, TypedDict, Optional
 
 
@@ -26,11 +30,16 @@ class BlockFormat(TypedDict):
 
 class PygameInteractions(InteractionHandler):
     """
-    Implements GUI and user interactions in PyGame.
+    Implements GUI and user interactions in PyGame. The game advances with a fixed tick rate, the display is redrawn at
+    most with frames_per_second, and key presses between two ticks are buffered, so that quick successive turns are
+    applied one per tick instead of only the last one.
     """
 
+    # maximal number of buffered key presses
+    input_buffer_size = 3
+
     def __init__(self, display: pygame.Surface, block_length: int, ticks_per_second: int = 30,
-                 formatting_file: Optional[str] = None):
+                 formatting_file: Optional[str] = None, frames_per_second: Optional[int] = 60):
         """
         Initializes the board and loads the formatting parameters.
         :param display: display that should be used for user interaction
@@ -38,13 +47,18 @@ class PygameInteractions(InteractionHandler):
         :param ticks_per_second: duration for each tick of the game.
         :param formatting_file: path to a formatting file specifying the display styles; if not file is given,
             default values are set
+        :param frames_per_second: maximal rate of redrawing the display; None to draw every tick
         """
-        self.clock = pygame.time.Clock()
+        self.tick_limiter = RateLimiter(ticks_per_second)
+        self.frame_limiter = RateLimiter(frames_per_second)
         self.display = display
         self.ticks_per_second = ticks_per_second
         self.moving_direction = (0, 0)
+        self.input_buffer = deque(maxlen=self.input_buffer_size)
         self.block_length = block_length
         self.font = pygame.font.SysFont('comicsansms', 15, bold=True)
+        self.renderer = None
+        self.pending_frame = None
 
         # validate that block length and window_size are consistent
         display_size = self.display.get_size()
@@ -56,11 +70,11 @@ class PygameInteractions(InteractionHandler):
             raise Exception('Loading of formatting file is not yet implemented!')
         else:
             self.board_formatting: Dict[str, BlockFormat] = {
-                'head': {'code': 101, 'color': (0, 0, 255), 'picture': None},
+                'head': {'code': 101, 'color': (0, 0, 255), 'picture': HEAD_PICTURE},
                 'wall': {'code': 1, 'color': (0, 0, 0), 'picture': None},
                 'valid': {'code': 0, 'color': (255, 255, 255), 'picture': None},
                 'snake': {'code': 100, 'color': (100, 100, 255), 'picture': None},
-                'food': {'code': 200, 'color': (255, 0, 0), 'picture': None}
+                'food': {'code': 200, 'color': (255, 0, 0), 'picture': FOOD_PICTURE}
             }
 
     def get_encoding_dict(self) -> BoardEncodingDict:
@@ -73,47 +87,52 @@ class PygameInteractions(InteractionHandler):
         """
         Forward the updated board to the player.
         """
-        for kind, formatting in self.board_formatting.items():
-            x, y = np.where(geometry_matrix == formatting['code'])
-            block: Tuple[int, int]
-            for block in zip(x, y):
-                self._draw_block(block, kind)
-
-        self.display.blit(self.font.render(f'{current_score}', True, (0, 255, 255)),  (25, 0))
+        if self.renderer is None:
+            self.renderer = BoardRenderer(self.display, self.block_length, self.board_formatting, self.font)
+        self.pending_frame = (geometry_matrix, current_score, moving_direction)
+        self._render_pending_frame()
 
-        pygame.display.update()
+    def _render_pending_frame(self, force: bool = False) -> None:
+        """
+        Draws the last pushed board if a frame is due.
 
-    def _draw_block(self, block: Tuple[int, int], kind: str) -> None:
+        :param force: draw the board even if no frame is due
         """
-        Draws a specific block on display.
+        if self.pending_frame is not None and (force or self.frame_limiter.ready()):
+            self.renderer.render(*self.pending_frame)
+            self.pending_frame = None
 
-        :param block: (x, y) - (block) coordinates of the block to draw
-        :param kind: kind of block to draw; must be key of self.board_formatting
+    def finish_game(self) -> None:
         """
-        # ToDo: implement display picture: https://pythonprogramming.net/displaying-images-pygame/
-        if self.board_formatting[kind]['picture'] is not None:
-            raise Exception('Displaying pictures has not yet been implemented!')
-        else:
-            rectangle = [block[1] * self.block_length, block[0] * self.block_length,
-                         self.block_length, self.block_length]
-            pygame.draw.rect(self.display, self.board_formatting[kind]['color'], rectangle)
+        Draws the final board even if no frame is due, so that the end of the game is shown.
+        """
+        self._render_pending_frame(force=True)
 
     def get_interaction(self) -> direction:
         """
-        Waits for player's input and returns the moving direction for the next snake
+        Waits for the next tick of the game while buffering the player's input and returns the moving direction for
+        the next snake
         """
+        self.tick_limiter.wait(poll=self._poll_events, poll_interval=self.frame_limiter.interval or 1 / 60)
+        if self.input_buffer:
+            self.moving_direction = self.input_buffer.popleft()
+        return self.moving_direction
 
+    def _poll_events(self) -> None:
+        """
+        Appends the directions of new key presses to the input buffer; repeated presses of the same key are ignored.
+        Draws a skipped frame as soon as it is due.
+        """
+        self._render_pending_frame()
         key_direction_map = {pygame.K_DOWN: (1, 0),
                              pygame.K_RIGHT: (0, 1),
                              pygame.K_UP: (-1, 0),
                              pygame.K_LEFT: (0, -1)
                              }
 
-        self.clock.tick(self.ticks_per_second)
-
         for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.key in key_direction_map.keys():
-                    self.moving_direction = key_direction_map[event.key]
-
-        return self.moving_direction
+            if event.type == pygame.KEYDOWN and event.key in key_direction_map:
+                key_direction = key_direction_map[event.key]
+                last_direction = self.input_buffer[-1] if self.input_buffer else self.moving_direction
+                if key_direction != last_direction:
+                    self.input_buffer.append(key_direction)
@@ -3,8 +3,10 @@ from typing import Dict, Tuple, TypedDict, Optional
 import numpy as np
 import pygame
 
+from board_renderer import BoardRenderer, HEAD_PICTURE, FOOD_PICTURE
 from interaction_handler import InteractionHandler, BoardEncodingDict, direction
 from player import Player
+from rate_limiter import RateLimiter
 
 
 class ConfigurationError(Exception):
@@ -29,12 +31,13 @@ class BlockFormat(TypedDict):
 
 class PyGamePyTorchInteractionHandler(InteractionHandler):
     """
-    Implements Interaction with AI
+    Implements Interaction with AI. If the game is shown, the simulation runs with ticks_per_second (or as fast as
+    possible) while the display is redrawn at most with frames_per_second; frames in between are skipped.
     """
 
     def __init__(self, player: Player, display: Optional[pygame.Surface] = None,
                  block_length: Optional[int] = None, ticks_per_second: Optional[int] = None,
-                 formatting_file: Optional[str] = None):
+                 formatting_file: Optional[str] = None, frames_per_second: Optional[int] = 60):
         """
         Initializes the board and loads the formatting parameters.
 
@@ -42,16 +45,20 @@ class PyGamePyTorchInteractionHandler(InteractionHandler):
         :param display: display that should be used for user interaction
         :param block_length: length of one block of the board in px
         :param ticks_per_second: duration for each tick of the game; if set to None, then the game is not
-            displayed and answers are immediately passed to the game
+            slowed down and answers are immediately passed to the game
         :param formatting_file: path to a formatting file specifying the display styles; if not file is given,
             default values are set
+        :param frames_per_second: maximal rate of redrawing the display; None to draw every tick
         """
         self.player = player
         self.ticks_per_second = None
         self.block_length = block_length
-        self.font = pygame.font.SysFont("comicsansms", 15, bold=True)
+        self.font = None
+        self.renderer = None
+        self.pending_frame = None
         self.display = None
-        self.clock = None
+        self.tick_limiter = None
+        self.frame_limiter = RateLimiter(frames_per_second)
         self.block_length = None
         self.show_game = False
 
@@ -67,11 +74,11 @@ class PyGamePyTorchInteractionHandler(InteractionHandler):
             raise Exception('Loading of formatting file is not yet implemented!')
         else:
             self.board_formatting: Dict[str, BlockFormat] = {
-                'head': {'code': 101, 'color': (0, 0, 255), 'picture': None},
+                'head': {'code': 101, 'color': (0, 0, 255), 'picture': HEAD_PICTURE},
                 'wall': {'code': 1, 'color': (0, 0, 0), 'picture': None},
                 'valid': {'code': 0, 'color': (255, 255, 255), 'picture': None},
                 'snake': {'code': 100, 'color': (100, 100, 255), 'picture': None},
-                'food': {'code': 200, 'color': (255, 0, 0), 'picture': None}
+                'food': {'code': 200, 'color': (255, 0, 0), 'picture': FOOD_PICTURE}
             }
 
     def set_display(self, display: Optional[pygame.Surface] = None, block_length: Optional[int] = None):
@@ -89,6 +96,9 @@ class PyGamePyTorchInteractionHandler(InteractionHandler):
 
         self.display = display
         self.block_length = block_length
+        self.renderer = None
+        if self.font is None:
+            self.font = pygame.font.SysFont("comicsansms", 15, bold=True)
 
         # validate that block length and window_size are consistent
         display_size = self.display.get_size()
@@ -104,10 +114,10 @@ class PyGamePyTorchInteractionHandler(InteractionHandler):
         """
         if ticks_per_second is not None:
             self.ticks_per_second = ticks_per_second
-            self.clock = pygame.time.Clock()
+            self.tick_limiter = RateLimiter(ticks_per_second)
         else:
             self.ticks_per_second = None
-            self.clock = None
+            self.tick_limiter = None
 
     def get_encoding_dict(self) -> BoardEncodingDict:
         """Returns the encoding for different board elements."""
@@ -122,36 +132,34 @@ class PyGamePyTorchInteractionHandler(InteractionHandler):
         self.player.push_board_status(geometry_matrix, moving_direction, current_score, food_score)
 
         if self.show_game:
-            for kind, formatting in self.board_formatting.items():
-                x, y = np.where(geometry_matrix == formatting['code'])
-
-                block: Tuple[int, int]
-                for block in zip(x, y):
-                    self._draw_block(block, kind)
+            if self.renderer is None:
+                self.renderer = BoardRenderer(self.display, self.block_length, self.board_formatting, self.font)
+            self.pending_frame = (geometry_matrix, current_score, moving_direction)
+            if self.tick_limiter is not None:
+                self.tick_limiter.wait(poll=self._render_pending_frame,
+                                       poll_interval=self.frame_limiter.interval or 1 / 60)
+            else:
+                self._render_pending_frame()
+
+    def _render_pending_frame(self, force: bool = False) -> None:
+        """
+        Draws the last pushed board and handles the window events if a frame is due.
 
-            self.display.blit(self.font.render(f'{current_score}', True, (0, 255, 255)),  (25, 0))
-            pygame.display.update()
-            if self.clock is not None:
-                self.clock.tick(self.ticks_per_second)
+        :param force: draw the board even if no frame is due
+        """
+        if self.pending_frame is not None and (force or self.frame_limiter.ready()):
+            self.renderer.render(*self.pending_frame)
+            self.pending_frame = None
 
             for event in pygame.event.get():
                 # ToDo: remove this crap that is caused by fucking OS X/PyGame Interaction Error
                 pass
 
-    def _draw_block(self, block: Tuple[int, int], kind: str) -> None:
+    def finish_game(self) -> None:
         """
-        Draws a specific block on display.
-
-        :param block: (x, y) - (block) coordinates of the block to draw
-        :param kind: kind of block to draw; must be key of self.board_formatting
+        Draws the final board even if no frame is due, so that the end of the game is shown.
         """
-        # ToDo: implement display picture: https://pythonprogramming.net/displaying-images-pygame/
-        if self.board_formatting[kind]['picture'] is not None:
-            raise Exception('Displaying pictures has not yet been implemented!')
-        else:
-            rectangle = [block[1] * self.block_length, block[0] * self.block_length,
-                         self.block_length, self.block_length]
-            pygame.draw.rect(self.display, self.board_formatting[kind]['color'], rectangle)
+        self._render_pending_frame(force=True)
 
     def get_interaction(self) -> direction:
         """
@@ -1,44 +1,84 @@
+import copy
 import random
-from collections import deque
-from typing import Tuple, List
+from typing import Tuple, Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import torch
 import torch.nn as nn
 import torch.optim as optim
 
-from network import Linear_QNet2
+from actions import ACTION_DTYPE, N_ACTIONS, RIGHT
+from board_observation import board_observation, observation_shape
+from metrics import MetricsLog, LivePlot
+from network import Linear_QNet2, QNet
 from player import Player
+from profiling import Profiler, timed
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from state_features import state_features, N_FEATURES
 
 
 class PyTorchPlayer(Player):
-    def __init__(self):
+    def __init__(self, plot: bool = True, memory_capacity: int = 100000, state_dtype: np.dtype = np.uint8,
+                 prioritized: bool = False, train_interval: Optional[int] = None, batch_size: int = 64,
+                 target_update: Optional[int] = None, tau: Optional[float] = None, double_dqn: bool = False,
+                 board_shape: Optional[Tuple[int, int]] = None, n_frames: int = 1,
+                 profiler: Optional[Profiler] = None):
         self.counter_games = 0
         self.counter_move = 0
+        self.counter_steps = 0
+
+        # if train_interval is set, the per-move training is replaced by a minibatch update every train_interval moves
+        self.train_interval = train_interval
+        self.batch_size = batch_size
+
+        # if board_shape (shape of the padded board) is set, the states are the stacked board planes of
+        # board_observation and the model is a QNet instead of Linear_QNet2 on the 12 state features
+        self.board_shape = board_shape
+        if board_shape is None:
+            state_shape = (N_FEATURES,)
+        else:
+            state_shape = observation_shape(board_shape, n_frames)
 
         self.gamma = 0.9
         self.epsilon = 0
-        self.memory = deque()
+        memory_class = PrioritizedReplayBuffer if prioritized else ReplayBuffer
+        self.memory = memory_class(capacity=memory_capacity, state_size=state_shape, state_dtype=state_dtype)
         self.lr = 1e-4
-        self.model = Linear_QNet2(12, 256, 4)
-        self.model.train()
+        if board_shape is None:
+            self.model = Linear_QNet2(N_FEATURES, 256, N_ACTIONS)
+        else:
+            self.model = QNet(*board_shape, N_ACTIONS, in_channels=state_shape[0], padding=2)
+        # the model is only in training mode during the gradient steps: acting and the targets use the running
+        # statistics of the batch normalization of QNet and do not update them
+        self.model.eval()
         self.optimizer = optim.Adam(self.model.parameters(), lr=0.001)
         self.loss_fn = nn.MSELoss()
 
+        # optional target network: synced every target_update gradient steps or, if tau is set, by a soft update after
+        # each step; without it the targets are computed with self.model
+        self.target_update = target_update
+        self.tau = tau
+        self.double_dqn = double_dqn
+        self.counter_updates = 0
+        self.target_model = None
+        if target_update is not None or tau is not None:
+            self.target_model = copy.deepcopy(self.model)
+            self.target_model.requires_grad_(False)
+            self.target_model.eval()
+
         self.previous_status = None
         self.new_status = None
         self.encoding = None
+        # features of the previous and the new status are written alternately into these buffers
+        self.feature_buffers = np.zeros((2,) + state_shape, dtype=np.uint8)
+        self.counter_status = 0
+        self.head = None
+        self.food = None
 
-        self.history = pd.DataFrame(columns=['score', 'moves'])
-        self.plot = dict()
-        self.plot['figure'], self.plot['ax'] = plt.subplots()
-        self.plot['lines'], = self.plot['ax'].plot([], [], 'o')
-        # Autoscale on unknown axis and known lims on the other
-        self.plot['ax'].set_autoscaley_on(True)
-        # Other stuff
-        self.plot['ax'].grid()
+        # records the durations of observation, inference and training, SGD steps and the replay size; None to disable
+        self.profiler = profiler
+        self.history = MetricsLog()
+        self.plot = LivePlot() if plot else None
 
     def push_board_status(self, occupation_matrix: np.array, moving_direction: Tuple[int, int],
                           score: int, food_score: int) -> None:
@@ -47,39 +87,34 @@ class PyTorchPlayer(Player):
                            'moving_direction': moving_direction,
                            'score': score,
                            'food_score': food_score,
-                           'predictor_vector': None,
+                           'predictor_vector': self.feature_buffers[self.counter_status % 2],
                            'prediction': None,
                            'move': None}
+        self.counter_status += 1
 
         self.get_state_vector()
 
-    def get_response(self) -> Tuple[int, int]:
+    def get_response(self) -> int:
         """
-        predict response and map it to actual movement
+        predict response, which is directly the encoded movement (see actions)
         get reward
         train shor term memory and fill memeory of round
 
         """
         self.new_status['prediction'] = self.predict_action()
-
-        if self.new_status['prediction'][0] == 1:  # up
-            self.new_status['move'] = (-1, 0)
-        elif self.new_status['prediction'][1] == 1:  # left
-            self.new_status['move'] = (0, -1)
-        elif self.new_status['prediction'][2] == 1:  # down
-            self.new_status['move'] = (1, 0)
-        elif self.new_status['prediction'][3] == 1:  # right
-            self.new_status['move'] = (0, 1)
+        self.new_status['move'] = self.new_status['prediction']
 
         if self.counter_move == 0:
             self.previous_status = self.new_status
-            self.previous_status['move'] = (0, 1)
+            self.previous_status['move'] = RIGHT
 
         reward = self.new_status['score']-self.previous_status['score']-1
-        # self.train_short_memory(state_old, final_move, reward, state_new, done)
-        self.train_short_memory(self.previous_status['predictor_vector'], self.previous_status['prediction'], reward, self.new_status['predictor_vector'], False)
+        if self.train_interval is None:
+            # self.train_short_memory(state_old, final_move, reward, state_new, done)
+            self.train_short_memory(self.previous_status['predictor_vector'], self.previous_status['prediction'], reward, self.new_status['predictor_vector'], False)
         # self.remember(state_old, final_move, reward, state_new, done)
         self.remember(self.previous_status['predictor_vector'], self.previous_status['prediction'], reward, self.new_status['predictor_vector'], False)
+        self.count_step()
 
         self.previous_status = self.new_status
         self.counter_move += 1
@@ -89,6 +124,8 @@ class PyTorchPlayer(Player):
     def new_round(self) -> None:
         """"At the beginning of a new round set move counter to zero"""
         self.counter_move = 0
+        self.head = None
+        self.food = None
 
     def closing_action(self, score: int) -> None:
         """
@@ -106,102 +143,215 @@ class PyTorchPlayer(Player):
 
         reward = -30
 
-        self.train_short_memory(self.previous_status['predictor_vector'], self.previous_status['prediction'], reward, self.new_status['predictor_vector'], True)
+        if self.train_interval is None:
+            self.train_short_memory(self.previous_status['predictor_vector'], self.previous_status['prediction'], reward, self.new_status['predictor_vector'], True)
         self.remember(self.previous_status['predictor_vector'], self.previous_status['prediction'], reward, self.new_status['predictor_vector'], True)
         self.train_long_memory(self.memory)
+        self.record_game(score)
+
+    def close(self) -> None:
+        """
+        Stops the plot process; the player can still be used without plot.
+        """
+        if self.plot is not None:
+            self.plot.close()
+            self.plot = None
 
-        self.history.loc[self.counter_games] = [score, self.counter_move]
-        # Update data plot data
-        self.plot['lines'].set_xdata(self.history.index)
-        self.plot['lines'].set_ydata(self.history['score'])
-        # Need both of these in order to rescale
-        self.plot['ax'].relim()
-        self.plot['ax'].autoscale_view()
-        # We need to draw *and* flush
-        self.plot['figure'].show()
-        self.plot['figure'].canvas.flush_events()
+    def record_game(self, score: int) -> None:
+        """
+        Append score and number of moves of the finished game to the history and send the score to the plot process.
 
+        :param score:
+        :return:
+        """
+        self.history.append(self.counter_games, score, self.counter_move)
+        if self.profiler is not None:
+            self.profiler.set_gauge('replay_size', len(self.memory))
+            self.profiler.set_gauge('score', score)
+        if self.plot is not None:
+            self.plot.push(self.counter_games, score)
+
+    @timed('observation')
     def get_state_vector(self) -> None:
         """
         set predictor vector
+
+        Head and food are tracked between ticks (the head moves by the moving direction, the food stays until it is
+        eaten) and verified with one lookup each; the matrix is only scanned if a guess is wrong.
         :return:
         """
-        predictor_vector = []
-        head = np.asarray(np.where(self.new_status['matrix'] == self.encoding['head'])).flatten()
-        food = np.asarray(np.where(self.new_status['matrix'] == self.encoding['food'])).flatten()
+        matrix = self.new_status['matrix']
+        if self.board_shape is not None:
+            # the frames of the previous tick are shifted by one; a new round starts with copies of its first board
+            previous = None if self.counter_move == 0 else self.previous_status['predictor_vector']
+            board_observation(matrix, self.encoding, previous, out=self.new_status['predictor_vector'])
+            return
+
+        moving_direction = self.new_status['moving_direction']
+        if self.head is not None:
+            self.head = (self.head[0] + moving_direction[0], self.head[1] + moving_direction[1])
+        self.head = self._locate(self.head, self.encoding['head'])
+        self.food = self._locate(self.food, self.encoding['food'])
+
+        state_features(matrix, self.head, self.food, moving_direction, self.encoding,
+                       out=self.new_status['predictor_vector'])
+
+    def _locate(self, guess: Optional[Tuple[int, int]], code: int) -> Tuple[int, int]:
+        """
+        :param guess: expected (x, y) of the element
+        :param code: encoding of the element
+        :return: (x, y) of the element in the new status
+        """
+        matrix = self.new_status['matrix']
+        if guess is not None and matrix[guess] == code:
+            return guess
+        x, y = np.where(matrix == code)
+        return x[0], y[0]
+
+    @timed('inference')
+    def predict_action(self) -> int:
+        """
+        :return: epsilon-greedy action (see actions)
+        """
+        self.epsilon = 80 - self.counter_games
+        if random.randint(0, 200) < self.epsilon:
+            return random.randint(0, N_ACTIONS - 1)
+        state0 = torch.tensor(self.new_status['predictor_vector'], dtype=torch.float).unsqueeze(0)
+        with torch.inference_mode():
+            prediction = self.model(state0)
+        return torch.argmax(prediction).item()
+
+    @timed('inference_batch')
+    def act_batch(self, states: np.ndarray, random_generator: np.random.Generator) -> np.ndarray:
+        """
+        Epsilon-greedy actions for the states of many games with a single forward pass.
 
-        # Check if directions are free
-        predictor_vector.append(False if self.new_status['matrix'][head[0]-1, head[1]+0] in (self.encoding['valid'], self.encoding['food']) else True)  # up
-        predictor_vector.append(False if self.new_status['matrix'][head[0]+0, head[1]-1] in (self.encoding['valid'], self.encoding['food']) else True)  # left
-        predictor_vector.append(False if self.new_status['matrix'][head[0]+1, head[1]+0] in (self.encoding['valid'], self.encoding['food']) else True)  # down
-        predictor_vector.append(False if self.new_status['matrix'][head[0]+0, head[1]+1] in (self.encoding['valid'], self.encoding['food']) else True)  # right
+        :param states: (n, 12) predictor vectors
+        :param random_generator: generator for the exploration
+        :return: actions (see actions)
+        """
+        self.epsilon = 80 - self.counter_games
+        with torch.inference_mode():
+            actions = torch.argmax(self.model(torch.from_numpy(states).float()), dim=1).numpy().astype(ACTION_DTYPE)
+        explore = random_generator.integers(0, 201, size=len(states)) < self.epsilon
+        actions[explore] = random_generator.integers(0, 4, size=np.count_nonzero(explore))
+        return actions
 
-        # Which direction are we running?
-        predictor_vector.append(True if self.new_status['moving_direction'] == (-1, 0) else False)  # up
-        predictor_vector.append(True if self.new_status['moving_direction'] == (0, -1) else False)  # left
-        predictor_vector.append(True if self.new_status['moving_direction'] == (1, 0) else False)  # down
-        predictor_vector.append(True if self.new_status['moving_direction'] == (0, 1) else False)  # right
+    def count_step(self, n_steps: int = 1) -> None:
+        """
+        Counts moves and trains on a minibatch every train_interval moves.
 
-        # In which direction is the next food
-        predictor_vector.append(True if food[0] < head[0] else False)  # above
-        predictor_vector.append(True if food[1] < head[1] else False)  # left
-        predictor_vector.append(True if food[0] > head[0] else False)  # down
-        predictor_vector.append(True if food[1] > head[1] else False)  # right
+        :param n_steps: number of moves made, e.g. one per concurrent game
+        """
+        previous_steps = self.counter_steps
+        self.counter_steps += n_steps
+        if self.train_interval is not None:
+            for _ in range(self.counter_steps // self.train_interval - previous_steps // self.train_interval):
+                self.train_step(self.memory, self.batch_size)
+
+    @timed('train_long_memory')
+    def train_long_memory(self, memory: ReplayBuffer) -> None:
+        self.counter_games += 1
+        self.train_step(memory, 1000)
 
-        self.new_status['predictor_vector'] = np.asarray(list(map(int, predictor_vector)))
+    @timed('train_step')
+    def train_step(self, memory: ReplayBuffer, batch_size: int) -> None:
+        """
+        One gradient step on a minibatch of the memory.
 
-    def predict_action(self) -> List[int]:
-        self.epsilon = 80 - self.counter_games
-        final_move = [0, 0, 0, 0]
-        if random.randint(0, 200) < self.epsilon:
-            move = random.randint(0, 3)
-            final_move[move] += 1
-        else:
-            state0 = torch.tensor(self.new_status['predictor_vector'], dtype=torch.float)
-            prediction = self.model(state0)
-            move = torch.argmax(prediction).item()
-            final_move[move] += 1
-        return final_move
+        :param memory: replay memory to sample from
+        :param batch_size: size of the minibatch
+        """
+        if len(memory) == 0:
+            return
 
-    def train_long_memory(self, memory) -> None:
-        self.counter_games += 1
-        if len(memory) > 1000:
-            minibatch = random.sample(memory, 1000)
-        else:
-            minibatch = memory
-
-        state, action, reward, next_state, done = zip(*minibatch)
-        state = torch.tensor(state, dtype=torch.float)  # [1, ... , 0]
-        action = torch.tensor(action, dtype=torch.long)  # [1, 0, 0]
-        reward = torch.tensor(reward, dtype=torch.float)  # int
-        next_state = torch.tensor(next_state, dtype=torch.float)  # [True, ... , False]
-        target = reward + self.gamma * torch.max(self.model(next_state), dim=1)[0]
-        location = [[x] for x in torch.argmax(action, dim=1).numpy()]
-        location = torch.tensor(location)
-        pred = self.model(state).gather(1, location)  # [action]
+        self.optimizer.zero_grad()
+        indices = memory.sample_indices(batch_size)
+        state, action, reward, next_state, done = memory.gather(indices)
+        weights = memory.importance_weights(indices)
+        with torch.no_grad():
+            if self.target_model is None:
+                next_value = torch.max(self.model(next_state), dim=1)[0]
+            else:
+                # the online model only selects the actions of Double-DQN
+                online_q_values = self.model(next_state) if self.double_dqn else None
+                next_value = self.next_state_value(next_state, online_q_values)
+        # terminal transitions are not bootstrapped
+        target = reward + self.gamma * next_value * ~done
+        self.model.train()
+        pred = self.model(state).gather(1, action.unsqueeze(1))  # [action]
         pred = pred.squeeze(1)
-        loss = self.loss_fn(target, pred)
+        td_error = target - pred
+        loss = torch.mean(weights * td_error ** 2)  # equals self.loss_fn(target, pred) for uniform weights
         loss.backward()
         self.optimizer.step()
+        self.model.eval()
+        memory.update_priorities(indices, td_error.detach().numpy())
+        self.update_target_model()
+
+    def next_state_value(self, next_state: torch.Tensor, online_q_values: Optional[torch.Tensor]) -> torch.Tensor:
+        """
+        Value of the next states estimated by the target model; with Double-DQN the action is selected by the online
+        model and evaluated by the target model.
 
+        :param next_state: batch of next states
+        :param online_q_values: q-values of the online model for next_state; only needed for Double-DQN
+        :return: value of each next state
+        """
+        with torch.no_grad():
+            target_q_values = self.target_model(next_state)
+            if self.double_dqn:
+                return target_q_values.gather(1, torch.argmax(online_q_values, dim=1, keepdim=True)).squeeze(1)
+            return torch.max(target_q_values, dim=1)[0]
+
+    def update_target_model(self) -> None:
+        """
+        Counts a gradient step and updates the target model: a soft (Polyak) update with tau after every step or a hard
+        copy every target_update steps.
+        """
+        self.counter_updates += 1
+        if self.profiler is not None:
+            self.profiler.count('sgd_steps')
+        if self.target_model is None:
+            return
+
+        with torch.no_grad():
+            if self.tau is not None:
+                for target, online in zip(self.target_model.parameters(), self.model.parameters()):
+                    target.mul_(1 - self.tau).add_(online, alpha=self.tau)
+                # running statistics of the batch normalization; the counters of the batches are copied
+                for target, online in zip(self.target_model.buffers(), self.model.buffers()):
+                    if target.is_floating_point():
+                        target.mul_(1 - self.tau).add_(online, alpha=self.tau)
+                    else:
+                        target.copy_(online)
+            elif self.counter_updates % self.target_update == 0:
+                self.target_model.load_state_dict(self.model.state_dict())
+
+    @timed('train_short_memory')
     def train_short_memory(self, state, action, reward, next_state, done) -> None:
-        state = torch.tensor(state, dtype=torch.float)
-        next_state = torch.tensor(next_state, dtype=torch.float)
-        action = torch.tensor(action, dtype=torch.long)
+        state = torch.tensor(state, dtype=torch.float).unsqueeze(0)
+        next_state = torch.tensor(next_state, dtype=torch.float).unsqueeze(0)
         reward = torch.tensor(reward, dtype=torch.float)
         target = reward
 
         if not done:
-            target = reward + self.gamma * torch.max(self.model(next_state))
-        pred = self.model(state)
+            with torch.no_grad():
+                if self.target_model is None:
+                    target = reward + self.gamma * torch.max(self.model(next_state))
+                else:
+                    online_q_values = self.model(next_state) if self.double_dqn else None
+                    target = reward + self.gamma * self.next_state_value(next_state, online_q_values)[0]
+        self.model.train()
+        pred = self.model(state)[0]
         target_f = pred.clone()
-        target_f[torch.argmax(action).item()] = target
+        target_f[action] = target
         loss = self.loss_fn(target_f, pred)
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
+        self.model.eval()
+        self.update_target_model()
 
     def remember(self, state, action, reward, next_state, done) -> None:
-        self.memory.append([state, action, reward, next_state, done])
-        if len(self.memory) > 100000:
-            self.memory.popleft()
+        self.memory.append(state, action, reward, next_state, done)
@@ -0,0 +1,25 @@
+import random
+from typing import Tuple
+
+import numpy as np
+
+from player import Player
+
+
+class RandomPlayer(Player):
+    """
+    Player that moves randomly and counts its moves; used by the benchmarks and tests.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.random = random.Random(seed)
+        self.matrix = None
+        self.ticks = 0
+
+    def push_board_status(self, occupation_matrix: np.array, moving_direction: Tuple[int, int],
+                          score: int, food_score: int) -> None:
+        self.matrix = occupation_matrix
+
+    def get_response(self) -> Tuple[int, int]:
+        self.ticks += 1
+        return self.random.choice([(-1, 0), (0, -1), (1, 0), (0, 1)])
@@ -0,0 +1,60 @@
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """
+    Schedules events at a fixed rate, e.g. simulation ticks or rendered frames. The deadlines follow a fixed grid, so
+    the rate does not drift with the duration of the work between two events; if the caller falls behind by more than
+    one interval, the grid restarts instead of catching up in a burst.
+
+    :ivar interval: time between two events in s; None if the rate is unlimited
+    :ivar deadline: time of the next event according to time.perf_counter
+    """
+
+    def __init__(self, rate: Optional[float]):
+        """
+        :param rate: events per second; None for no limit
+        """
+        self.interval = None if rate is None else 1 / rate
+        self.deadline = time.perf_counter()
+
+    def remaining(self) -> float:
+        """
+        :return: time until the next event in s; 0 if it is due
+        """
+        if self.interval is None:
+            return 0.
+        return max(self.deadline - time.perf_counter(), 0.)
+
+    def ready(self) -> bool:
+        """
+        Non-blocking check whether the next event is due; if so, the event is consumed.
+
+        :return: True if the event is due
+        """
+        if self.interval is None:
+            return True
+        now = time.perf_counter()
+        if now < self.deadline:
+            return False
+        self.deadline += self.interval
+        if self.deadline <= now:
+            self.deadline = now + self.interval
+        return True
+
+    def wait(self, poll: Optional[Callable[[], None]] = None, poll_interval: float = 1 / 60) -> None:
+        """
+        Blocks until the next event is due and consumes it.
+
+        :param poll: called at least every poll_interval while waiting, e.g. to handle input events
+        :param poll_interval: maximum time between two calls of poll in s
+        """
+        while True:
+            if poll is not None:
+                poll()
+            remaining = self.remaining()
+            if remaining <= 0:
+                break
+            time.sleep(remaining if poll is None else min(remaining, poll_interval))
+        self.ready()
@@ -0,0 +1,109 @@
+import argparse
+from typing import Optional, Tuple
+
+import numpy as np
+
+from actions import DIRECTION_TUPLES
+from game import Game
+from game_log import GameLog
+from interaction_handler import InteractionHandler, BoardEncodingDict, direction, default_encoding
+
+
+class ReplayInteractionHandler(InteractionHandler):
+    """
+    Plays the recorded moves of a game log. If a display handler is given (e.g. PygameInteractions), the boards are
+    shown by it and the replay runs with its tick rate; the input of the display handler is ignored.
+    """
+
+    def __init__(self, log: GameLog, display_handler: Optional[InteractionHandler] = None):
+        """
+        :param log: log of the game to replay
+        :param display_handler: handler that shows the game
+        """
+        self.actions = log.actions().tolist()
+        self.tick = 0
+        self.display_handler = display_handler
+
+    def get_encoding_dict(self) -> BoardEncodingDict:
+        """Returns the encoding for different board elements."""
+        if self.display_handler is None:
+            return default_encoding
+        return self.display_handler.get_encoding_dict()
+
+    def push_board_status(self, geometry_matrix: np.array, moving_direction: Tuple[int, int], current_score: int,
+                          food_score: int) -> None:
+        """Forwards the board to the display handler."""
+        if self.display_handler is not None:
+            self.display_handler.push_board_status(geometry_matrix, moving_direction, current_score, food_score)
+
+    def finish_game(self) -> None:
+        """Forwards the end of the game to the display handler."""
+        if self.display_handler is not None:
+            self.display_handler.finish_game()
+
+    def get_interaction(self) -> direction:
+        """
+        Returns the next recorded move
+        """
+        if self.display_handler is not None:
+            self.display_handler.get_interaction()
+        if self.tick == len(self.actions):
+            raise ValueError('The game did not end with the last recorded move.')
+        action = self.actions[self.tick]
+        self.tick += 1
+        return DIRECTION_TUPLES[action]
+
+
+def replay_game(log: GameLog, display_handler: Optional[InteractionHandler] = None) -> Game:
+    """
+    Reconstructs a recorded game. Without display handler, the moves are applied directly with Game.step at full speed.
+
+    :param log: log of the game
+    :param display_handler: handler that shows the game, e.g. PygameInteractions
+    :return: game after the last move
+    """
+    game = Game(log.board_dim, log.snake_start, log.food_start, random_seed=log.random_seed, verbose=False)
+    if display_handler is not None:
+        game.run_game(ReplayInteractionHandler(log, display_handler))
+    else:
+        done = False
+        for action in log.actions().tolist():
+            if done:
+                raise ValueError('The game ended before the last recorded move.')
+            _, _, done, _ = game.step(action)
+        if not done:
+            raise ValueError('The game did not end with the last recorded move.')
+
+    if game.game_score != log.final_score:
+        raise ValueError(f'Replayed score {game.game_score} differs from the recorded score {log.final_score}.')
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded game.')
+    parser.add_argument('log', help='path of the game log')
+    parser.add_argument('--show', action='store_true', help='show the game with pygame')
+    parser.add_argument('--ticks-per-second', type=int, default=10, help='speed of the shown replay')
+    args = parser.parse_args()
+
+    log = GameLog.load(args.log)
+    display_handler = None
+    if args.show:
+        import pygame
+        from pygame_interactions import PygameInteractions
+
+        block_size = 25
+        pygame.init()
+        pygame.font.init()
+        pygame.display.set_caption('Snake replay')
+        rows, cols = log.board_dim.shape[0] + 4, log.board_dim.shape[1] + 4
+        display = pygame.display.set_mode([cols * block_size, rows * block_size])
+        display_handler = PygameInteractions(display=display, block_length=block_size,
+                                             ticks_per_second=args.ticks_per_second)
+
+    game = replay_game(log, display_handler)
+    print('Score:', game.game_score, '\tTurns:', len(log))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+import json
+import os
+from typing import Tuple, Optional, Union
+
+import numpy as np
+import torch
+
+from actions import ACTION_DTYPE
+
+
+class ReplayBuffer:
+    """
+    Preallocated ring buffer of transitions with contiguous storage per field.
+    Once the capacity is reached, the oldest transitions are overwritten.
+
+    :ivar capacity: maximal number of stored transitions
+    :ivar states: (capacity, *state_shape) states before the action
+    :ivar actions: action taken (see actions)
+    :ivar rewards: reward received for the action
+    :ivar next_states: (capacity, *state_shape) states after the action
+    :ivar dones: True if the action ended the game
+    :ivar position: index the next transition is written to
+    """
+
+    def __init__(self, capacity: int = 100000, state_size: Union[int, Tuple[int, ...]] = 12,
+                 state_dtype: np.dtype = np.uint8, random_seed: Optional[int] = None):
+        """
+        :param capacity: maximal number of stored transitions
+        :param state_size: number of features of a state or shape of a state, e.g. (channels, rows, cols)
+        :param state_dtype: dtype the states are stored in; uint8 suffices for binary features
+        :param random_seed: seed of the random generator used for sampling
+        """
+        self.capacity = capacity
+        state_shape = (state_size,) if isinstance(state_size, int) else tuple(state_size)
+        self.states = np.zeros((capacity,) + state_shape, dtype=state_dtype)
+        self.actions = np.zeros(capacity, dtype=ACTION_DTYPE)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity,) + state_shape, dtype=state_dtype)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.position = 0
+        self.size = 0
+        self.random = np.random.default_rng(random_seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray, done: bool) -> int:
+        """
+        Stores one transition.
+
+        :return: index the transition was written to
+        """
+        index = self.position
+        self.states[self.position] = state
+        self.actions[self.position] = action
+        self.rewards[self.position] = reward
+        self.next_states[self.position] = next_state
+        self.dones[self.position] = done
+        self.position = (self.position + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return index
+
+    def extend(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray,
+               dones: np.ndarray) -> np.ndarray:
+        """
+        Stores a batch of transitions with one write per field.
+
+        :return: indices the transitions were written to
+        """
+        n = len(actions)
+        if n > self.capacity:  # only the newest transitions fit into the buffer
+            states, actions, rewards, next_states, dones = (
+                field[-self.capacity:] for field in (states, actions, rewards, next_states, dones))
+            n = self.capacity
+        indices = (self.position + np.arange(n)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return indices
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """
+        :param batch_size: number of transitions to draw
+        :return: indices of batch_size distinct transitions, or of all transitions if fewer are stored
+        """
+        if self.size <= batch_size:
+            return np.arange(self.size)
+        return self.random.choice(self.size, size=batch_size, replace=False)
+
+    def gather(self, indices: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor,
+                                                   torch.Tensor]:
+        """
+        :param indices: indices of the transitions
+        :return: tensors (state, action, reward, next_state, done) of the selected transitions
+        """
+        return (torch.from_numpy(self.states[indices]).float(),
+                torch.from_numpy(self.actions[indices].astype(np.int64)),
+                torch.from_numpy(self.rewards[indices]),
+                torch.from_numpy(self.next_states[indices]).float(),
+                torch.from_numpy(self.dones[indices]))
+
+    def sample(self, batch_size: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor,
+                                               torch.Tensor]:
+        """
+        Draws a uniform minibatch without replacement.
+
+        :param batch_size: number of transitions to draw
+        :return: tensors (state, action, reward, next_state, done) of the minibatch
+        """
+        return self.gather(self.sample_indices(batch_size))
+
+    fields = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+    def save(self, directory: str) -> None:
+        """
+        Writes the storage arrays as .npy files and the state of the buffer as json into directory.
+
+        :param directory: existing directory
+        """
+        for field in self.fields:
+            np.save(os.path.join(directory, f'{field}.npy'), getattr(self, field))
+        with open(os.path.join(directory, 'replay_buffer.json'), 'w') as file:
+            json.dump(self.get_state(), file)
+
+    def load(self, directory: str) -> None:
+        """
+        Restores a buffer written by save. The arrays are read into memory, so that no file in directory stays mapped
+        and the directory can be replaced by the next checkpoint (which fails for mapped files on Windows).
+
+        :param directory: directory written by save
+        """
+        for field in self.fields:
+            setattr(self, field, np.load(os.path.join(directory, f'{field}.npy')))
+        self.capacity = len(self.actions)
+        with open(os.path.join(directory, 'replay_buffer.json')) as file:
+            self.set_state(json.load(file))
+
+    def get_state(self) -> dict:
+        """
+        :return: json-serializable state of the buffer besides the storage arrays
+        """
+        return {'position': self.position, 'size': self.size, 'random': self.random.bit_generator.state}
+
+    def set_state(self, state: dict) -> None:
+        """
+        :param state: state returned by get_state
+        """
+        self.position = state['position']
+        self.size = state['size']
+        self.random.bit_generator.state = state['random']
+
+    def importance_weights(self, indices: np.ndarray) -> torch.Tensor:
+        """
+        :param indices: indices of sampled transitions
+        :return: weights of the transitions in the loss; uniform sampling needs no correction
+        """
+        return torch.ones(len(indices))
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        """
+        Uniform sampling ignores the TD errors of the trained transitions.
+        """
+        pass
+
+
+class SumTree:
+    """
+    Binary tree in array layout in which every node holds the sum of its children.
+    Leaves hold the priorities; sampling proportional to priority and updating a priority take O(log n).
+
+    :ivar leaf_offset: index of the first leaf; the root has index 1
+    :ivar tree: sums of all nodes
+    """
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: number of leaves
+        """
+        self.leaf_offset = 1 << max(int(np.ceil(np.log2(capacity))), 0)
+        self.tree = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    def total(self) -> float:
+        """
+        :return: sum of all priorities
+        """
+        return self.tree[1]
+
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        """
+        :return: priorities of the leaves
+        """
+        return self.tree[indices + self.leaf_offset]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """
+        Sets the priorities of the leaves and recomputes the sums of their ancestors level by level.
+        """
+        nodes = np.asarray(indices) + self.leaf_offset
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """
+        Descends from the root for all values at once.
+
+        :param values: prefix sums in [0, total)
+        :return: indices of the leaves whose priority interval contains the values
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.leaf_offset:
+            left = 2 * nodes
+            go_right = values >= self.tree[left]
+            values = np.where(go_right, values - self.tree[left], values)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Replay buffer that samples transitions proportional to their TD error.
+
+    :ivar alpha: exponent of the priorities; 0 = uniform sampling
+    :ivar beta: exponent of the importance sampling correction; annealed towards 1
+    :ivar beta_increment: increase of beta per sampled minibatch
+    :ivar epsilon: offset that keeps every transition's priority positive
+    :ivar max_priority: priority given to new transitions, so that each is trained on at least once
+    :ivar priorities: sum tree of the priorities
+    """
+
+    def __init__(self, capacity: int = 100000, state_size: Union[int, Tuple[int, ...]] = 12,
+                 state_dtype: np.dtype = np.uint8, random_seed: Optional[int] = None, alpha: float = 0.6,
+                 beta: float = 0.4, beta_increment: float = 0.001, epsilon: float = 1e-3):
+        super().__init__(capacity, state_size, state_dtype, random_seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.priorities = SumTree(capacity)
+
+    def append(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray, done: bool) -> int:
+        index = super().append(state, action, reward, next_state, done)
+        self.priorities.update(np.array([index]), self.max_priority ** self.alpha)
+        return index
+
+    def extend(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray,
+               dones: np.ndarray) -> np.ndarray:
+        indices = super().extend(states, actions, rewards, next_states, dones)
+        self.priorities.update(indices, self.max_priority ** self.alpha)
+        return indices
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """
+        Stratified sampling proportional to priority: one transition from each of batch_size equal segments of the
+        total priority.
+
+        :param batch_size: number of transitions to draw
+        :return: indices of the drawn transitions
+        """
+        batch_size = min(batch_size, self.size)
+        segment = self.priorities.total() / batch_size
+        values = (np.arange(batch_size) + self.random.random(batch_size)) * segment
+        indices = self.priorities.find(values)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return np.minimum(indices, self.size - 1)
+
+    def importance_weights(self, indices: np.ndarray) -> torch.Tensor:
+        """
+        :param indices: indices of sampled transitions
+        :return: importance sampling weights (N * P(i))^-beta, normalized by their maximum
+        """
+        probabilities = self.priorities.get(indices) / self.priorities.total()
+        weights = (self.size * probabilities) ** -self.beta
+        return torch.from_numpy(weights / weights.max()).float()
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        """
+        Sets the priorities of trained transitions to their absolute TD error.
+
+        :param indices: indices of the trained transitions
+        :param td_errors: TD errors of the transitions
+        """
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.priorities.update(indices, priorities ** self.alpha)
+
+    def save(self, directory: str) -> None:
+        super().save(directory)
+        np.save(os.path.join(directory, 'priorities.npy'), self.priorities.tree)
+
+    def load(self, directory: str) -> None:
+        super().load(directory)
+        self.priorities.tree = np.load(os.path.join(directory, 'priorities.npy'))
+        self.priorities.leaf_offset = len(self.priorities.tree) // 2
+
+    def get_state(self) -> dict:
+        state = super().get_state()
+        state.update({'beta': self.beta, 'max_priority': self.max_priority})
+        return state
+
+    def set_state(self, state: dict) -> None:
+        super().set_state(state)
+        self.beta = state['beta']
+        self.max_priority = state['max_priority']
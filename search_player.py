@@ -0,0 +1,500 @@
+import heapq
+import math
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from actions import ACTION_OF_DIRECTION, DIRECTION_TUPLES, N_ACTIONS, REVERSAL_TUPLE, to_action
+from board import Board
+from interaction_handler import BoardEncodingDict, default_encoding
+from player import Player
+from profiling import Profiler, timed
+
+# distance of the fields that the search has not reached
+UNSEEN = 1 << 30
+# the eight fields around a field in circular order; the even positions are the neighbours
+RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+def hamiltonian_cycle(board: Board) -> Optional[np.ndarray]:
+    """
+    Builds a Hamiltonian cycle through the valid fields of a board without inner walls: the first row from left to
+    right, the remaining rows in serpentines without the first column and the first column back up. Such a cycle exists
+    if the number of fields is even.
+
+    :param board: board of the games
+    :return: padded matrix of the index of each field in the cycle; -1 for walls; None if the board has no such cycle
+    """
+    layout = board.layout
+    rows, cols = layout.shape
+    if layout.any() or rows * cols % 2 or min(rows, cols) < 2:
+        return None
+    transposed = rows % 2 == 1
+    if transposed:
+        rows, cols = cols, rows
+
+    order = [(0, col) for col in range(cols)]
+    for row in range(1, rows):
+        columns = range(cols - 1, 0, -1) if row % 2 else range(1, cols)
+        order.extend((row, col) for col in columns)
+    order.extend((row, 0) for row in range(rows - 1, 0, -1))
+    order = np.array(order)
+    if transposed:
+        order = order[:, ::-1]
+
+    cycle = np.full(board.board_matrix.shape, -1, dtype=np.int64)
+    cycle[order[:, 0] + 2, order[:, 1] + 2] = np.arange(len(order))
+    return cycle
+
+
+class SearchPlayer(Player):
+    """
+    Autopilot that needs no training, e.g. as baseline or to generate games.
+    It searches the shortest path with A* backwards from the food to the head and keeps the search tree until the food
+    is eaten: the snake follows the decreasing distances to the food in the tree. The body only vacates fields ahead of
+    the head, so the tree stays valid and is searched once per apple. A search expands at most search_budget fields per
+    tick and is resumed in the next tick, which bounds the duration of a tick on large boards. If the search exhausts
+    the region of the food without reaching the head, the food is unreachable until the tail vacates a field next to
+    that region; the search is restarted only then or if the food moves.
+    On boards with a Hamiltonian cycle (see hamiltonian_cycle) the snake follows the cycle and takes a step of the path
+    only as a shortcut that keeps its body in the order of the cycle; thereby it never traps itself. Otherwise it
+    greedily takes the largest such shortcut that does not pass the food. On other boards the snake follows the path
+    only if a virtual snake that follows it can still reach its tail after eating, so that it never enters a dead end;
+    otherwise, and without a path, it moves to a free neighbour after which it can still reach its tail. Only if the
+    move may split the free fields, the areas behind the neighbours are counted by a flood fill that stops after twice
+    the length of the snake. These flood fills are not bounded by search_budget: a tick costs up to four flood fills
+    of the free area of the head, i.e. O(number of fields).
+
+    :ivar board: board of the games
+    :ivar encoding: encoding of the board elements
+    :ivar cycle: index of each field in the Hamiltonian cycle; None if the board has none
+    :ivar search_budget: maximal number of fields expanded by the search in a tick
+    :ivar body: fields of the snake tracked from the moves (body[0] is tail, body[-1] is head)
+    :ivar vacated: field the tail left last; None in the first tick
+    :ivar food: (x, y) of the food
+    :ivar costs: distance to the food of the fields in the search tree by index in the flattened board; UNSEEN for
+        fields out of the tree
+    :ivar retry_tick: tick in which the search for unreachable food is restarted; None if the food is not unreachable
+    :ivar plans: number of started searches
+    :ivar profiler: records the duration of get_response; None to disable
+    """
+
+    def __init__(self, board: Board, encoding: Optional[BoardEncodingDict] = None, search_budget: int = 250,
+                 profiler: Optional[Profiler] = None):
+        self.board = board
+        self.encoding = dict(default_encoding if encoding is None else encoding)
+        self.cycle = hamiltonian_cycle(board)
+        self.n_fields = int(np.count_nonzero(board.board_matrix == 0))
+        self.search_budget = search_budget
+        self.profiler = profiler
+        self.plans = 0
+
+        # the search works on the flattened board; the walls of the padding keep the neighbours of free fields within it
+        self.width = board.board_matrix.shape[1]
+        self.offsets = [row_offset * self.width + col_offset for row_offset, col_offset in DIRECTION_TUPLES[:N_ACTIONS]]
+        self.walls = bytearray((board.board_matrix == 1).ravel().tobytes())
+        rows, cols = np.indices(board.board_matrix.shape)
+        self.rows, self.cols = rows.ravel().tolist(), cols.ravel().tolist()
+        # the tables of the board are computed here instead of in the first tick
+        self.valid_neighbours = board.valid_neighbours
+
+        self.matrix = None
+        self.action = None
+        self.score = 0
+        self.ticks = 0
+        self.body = deque()
+        self.vacated = None
+        self.food = None
+        # 1 for fields the snake can enter, updated from the tracked body
+        self.free = bytearray()
+        self._reset_search()
+
+    def new_round(self) -> None:
+        """Forgets the tracked snake; a new game is also detected from the board."""
+        self.body = deque()
+        self.vacated = None
+        self.food = None
+        self._reset_search()
+
+    def _reset_search(self) -> None:
+        self.costs: Optional[List[int]] = None
+        self.heap: Optional[list] = None
+        self.retry_tick = None
+        # head for which the priorities of the heap are computed; True once the search reached the head
+        self.searched_head = None
+        self.reached = False
+        # True once the snake was found to escape after following the tree to the food
+        self.path_safe = False
+        # fields vacated by the tail since the search started
+        self.search_vacated: List[int] = []
+
+    def push_board_status(self, occupation_matrix: np.array, moving_direction: Tuple[int, int],
+                          score: int, food_score: int) -> None:
+        """
+        Tracks the body of the snake: the head moved by one field and the tail stays if the score increased.
+        """
+        self.matrix = occupation_matrix
+        self.action = to_action(moving_direction)
+        self.ticks += 1
+        expected_head = None
+        if self.body:
+            offset = DIRECTION_TUPLES[self.action]
+            expected_head = (self.body[-1][0] + offset[0], self.body[-1][1] + offset[1])
+        head = self._locate(expected_head, self.encoding['head'])
+
+        if head != expected_head or score < self.score:
+            # first tick of a new game
+            self.new_round()
+            self.body.append(head)
+            matrix = self.matrix
+            self.free = bytearray(((matrix == self.encoding['valid']) | (matrix == self.encoding['food'])).ravel()
+                                  .tobytes())
+        elif head != self.body[-1]:
+            if score <= self.score:
+                self.vacated = self.body.popleft()
+                self.free[self._index(self.vacated)] = 1
+                self.search_vacated.append(self._index(self.vacated))
+            self.body.append(head)
+            self.free[self._index(head)] = 0
+        self.score = score
+
+        food = self._locate(self.food, self.encoding['food'])
+        if food != self.food:
+            self.food = food
+            self._reset_search()
+
+    def _locate(self, guess: Optional[Tuple[int, int]], code: int) -> Tuple[int, int]:
+        """
+        :param guess: expected (x, y) of the element
+        :param code: encoding of the element
+        :return: (x, y) of the element
+        """
+        if guess is not None and self.matrix[guess] == code:
+            return guess
+        x, y = np.where(self.matrix == code)
+        return int(x[0]), int(y[0])
+
+    def _index(self, field: Tuple[int, int]) -> int:
+        return field[0] * self.width + field[1]
+
+    @timed('search')
+    def get_response(self) -> int:
+        """
+        :return: encoded action (see actions)
+        """
+        head = self.body[-1]
+        step = self._path_step(head)
+        if self.cycle is not None:
+            if step is not None and self._is_shortcut(head, step):
+                return self._move(head, step)
+            return self._move(head, self._shortcut(head))
+        if step is not None and self._path_is_safe(step):
+            return self._move(head, step)
+        return self._move(head, self._survival_step(head))
+
+    def _move(self, head: Tuple[int, int], field: Tuple[int, int]) -> int:
+        return ACTION_OF_DIRECTION[(field[0] - head[0], field[1] - head[1])]
+
+    def _neighbours(self, field: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        :return: neighbours of field that are no walls and not against the moving direction
+        """
+        reversal = REVERSAL_TUPLE[self.action]
+        valid = self.valid_neighbours
+        return [(field[0] + DIRECTION_TUPLES[action][0], field[1] + DIRECTION_TUPLES[action][1])
+                for action in range(N_ACTIONS) if action != reversal and valid[(action,) + field]]
+
+    def _free_neighbours(self, field: Tuple[int, int]) -> List[Tuple[int, int]]:
+        return [neighbour for neighbour in self._neighbours(field) if self.free[self._index(neighbour)]]
+
+    def _path_step(self, head: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        :return: next field on the way to the food in the search tree; None if the search has not reached the head yet
+            or the food is unreachable
+        """
+        if self.retry_tick is not None:
+            if self.ticks < self.retry_tick:
+                return None
+            self._start_search()
+        elif self.heap is None:
+            self._start_search()
+
+        step = self._tree_step(head)
+        # on a board with a cycle, the snake leaves the tree by shortcuts; the tree is not extended after it reached
+        # the head, so that the food is searched once
+        if step is None and not (self.cycle is not None and self.reached):
+            if not self.heap:
+                # the tree was completed in a previous tick, but its fields next to the head are occupied meanwhile
+                self._start_search()
+            self._search(head)
+            step = self._tree_step(head)
+        return step
+
+    def _start_search(self) -> None:
+        self._reset_search()
+        self.plans += 1
+        food = self._index(self.food)
+        self.costs = [UNSEEN] * len(self.free)
+        self.costs[food] = 0
+        self.heap = [(0, 0, food)]
+
+    def _tree_step(self, head: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        :return: free neighbour of the head with the smallest distance to the food in the tree, if it is smaller than
+            the distance of the head itself; None if there is none
+        """
+        costs = self.costs
+        best, best_cost = None, costs[self._index(head)]
+        for field in self._free_neighbours(head):
+            cost = costs[self._index(field)]
+            if cost < best_cost:
+                best, best_cost = field, cost
+        return best
+
+    def _search(self, head: Tuple[int, int]) -> None:
+        """
+        Continues the A* search from the food until a field next to the head is expanded, the budget of the tick is
+        spent or the region of the food is exhausted.
+        """
+        costs, heap, free, offsets, rows, cols = self.costs, self.heap, self.free, self.offsets, self.rows, self.cols
+        target = self._index(head)
+        head_row, head_col = head
+        budget = self.search_budget
+        self.path_safe = False
+        if head != self.searched_head:
+            # the heuristic is the distance to the head, which moved since the last tick; updating a field of the heap
+            # costs about a quarter of an expansion
+            self.heap = heap = [(abs(rows[node] - head_row) + abs(cols[node] - head_col) - negative_cost, negative_cost,
+                                 node) for _, negative_cost, node in heap]
+            heapq.heapify(heap)
+            self.searched_head = head
+            budget -= len(heap) // 4
+        for _ in range(max(budget, 1)):
+            if not heap:
+                self._food_unreachable()
+                return
+            _, negative_cost, node = heapq.heappop(heap)
+            cost = -negative_cost
+            if cost > costs[node]:
+                continue
+            found = False
+            for offset in offsets:
+                neighbour = node + offset
+                if neighbour == target:
+                    found = True
+                if not free[neighbour] or costs[neighbour] <= cost + 1:
+                    continue
+                costs[neighbour] = cost + 1
+                # ties are broken in favour of the deeper field, which goes straight to the head
+                heapq.heappush(heap, (cost + 1 + abs(rows[neighbour] - head_row) + abs(cols[neighbour] - head_col),
+                                      -cost - 1, neighbour))
+            if found:
+                self.reached = True
+                return
+
+    def _food_unreachable(self) -> None:
+        """
+        Sets the tick in which the search is restarted after the region of the food was exhausted. Only a field vacated
+        by the tail can connect the region of the food with the head: the search is retried when the first body field
+        next to the region is vacated, or in the next tick if such a field was vacated during the search.
+        """
+        region, walls, offsets = self.costs, self.walls, self.offsets
+        if any(region[field + offset] < UNSEEN for field in self.search_vacated for offset in offsets):
+            self.retry_tick = self.ticks + 1
+            return
+        self.retry_tick = math.inf
+        for position, field in enumerate(self.body):
+            field = self._index(field)
+            neighbours = [field + offset for offset in offsets]
+            if any(region[neighbour] < UNSEEN for neighbour in neighbours) and \
+                    any(not walls[neighbour] and region[neighbour] == UNSEEN for neighbour in neighbours):
+                # body[position] is vacated after position + 1 ticks, or later if the snake eats
+                self.retry_tick = self.ticks + position + 1
+                return
+
+    def _survival_step(self, head: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        :return: free neighbour of the head after which the snake can still reach its tail, else the tail if it is a
+            neighbour; among these the one with the largest area behind it, where areas of at least twice the length
+            of the snake count as equal; among equal neighbours the one closest to the food while it is searched,
+            else the one with the fewest free neighbours, so that the snake fills the space along walls and its body
+        """
+        fields = self._free_neighbours(head)
+        escapes = [field for field in fields if self._can_escape(field)]
+        if escapes:
+            fields = escapes
+        elif len(self.body) > 2 and self.body[0] in self._neighbours(head):
+            # the tail leaves its field in this tick, so the snake can follow it
+            return self.body[0]
+        if not fields:
+            neighbours = self._neighbours(head)
+            return neighbours[0] if neighbours else (head[0] - 1, head[1])
+        areas = {field: 0 for field in fields}
+        if len(fields) > 1 and self._may_split(head):
+            areas = self._areas(fields, 2 * len(self.body))
+
+        if self.retry_tick is None:
+            def key(field):
+                return -areas[field], abs(field[0] - self.food[0]) + abs(field[1] - self.food[1])
+        else:
+            def key(field):
+                return -areas[field], len(self._free_neighbours(field))
+        return min(fields, key=key)
+
+    def _path_is_safe(self, step: Tuple[int, int]) -> bool:
+        """
+        Follows the tree from step to the food with a virtual snake and checks that it can escape after eating. A safe
+        path stays safe until the tree changes, because the snake takes the same steps; an unsafe path is checked again
+        in the next tick.
+
+        :param step: next field of the path
+        :return: True if the snake does not trap itself on the way to the food
+        """
+        if not self.path_safe:
+            costs, free, offsets = self.costs, self.free, self.offsets
+            body = [self._index(field) for field in self.body]
+            node = self._index(step)
+            body.append(node)
+            while costs[node]:
+                node = min((node + offset for offset in offsets if free[node + offset]), key=costs.__getitem__,
+                           default=None)
+                if node is None or costs[node] >= costs[body[-1]]:
+                    return False
+                body.append(node)
+            self.path_safe = self._escapes(body, len(self.body) + 1)
+        return self.path_safe
+
+    def _can_escape(self, step: Tuple[int, int]) -> bool:
+        """
+        :return: True if the snake does not trap itself by moving to step
+        """
+        body = [self._index(field) for field in self.body]
+        body.append(self._index(step))
+        # after eating, the snake must be able to follow its tail like on the path to the food
+        grows = step == self.food
+        return self._escapes(body, len(self.body) + grows)
+
+    def _escapes(self, fields: List[int], length: int) -> bool:
+        """
+        Flood fills from the head of a virtual snake. The snake escapes if it can reach its tail, because it can follow
+        its tail forever. A snake of up to two fields cannot reverse, so it needs a detour back to the field behind
+        its head. The flood fill visits at most the free area of the head.
+
+        :param fields: indices of the fields the snake occupied, from the current tail to the virtual head
+        :param length: length of the virtual snake
+        :return: True if the snake escapes
+        """
+        free, offsets = self.free, self.offsets
+        occupied = set(fields[-length:])
+        vacated = set(fields[:-length]) - occupied
+        start = fields[-1]
+        tail = fields[-max(length, 2)]
+        occupied.add(tail)
+        visited = {start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for offset in offsets:
+                neighbour = node + offset
+                if neighbour == tail and (length > 2 or node != start):
+                    return True
+                if (free[neighbour] or neighbour in vacated) and neighbour not in occupied and neighbour not in visited:
+                    visited.add(neighbour)
+                    queue.append(neighbour)
+        return False
+
+    def _may_split(self, head: Tuple[int, int]) -> bool:
+        """
+        :return: False if the free neighbours of the head are connected through free fields around the head, so that
+            they belong to the same area
+        """
+        free = [self.free[self._index((head[0] + row_offset, head[1] + col_offset))] for row_offset, col_offset in RING]
+        if all(free):
+            return False
+        # count the runs of free fields around the head that contain a neighbour, starting after an occupied field
+        start = free.index(0)
+        runs = 0
+        in_run = has_neighbour = False
+        for step in range(1, len(RING) + 1):
+            position = (start + step) % len(RING)
+            if free[position]:
+                in_run = True
+                has_neighbour = has_neighbour or position % 2 == 0
+            elif in_run:
+                runs += has_neighbour
+                in_run = has_neighbour = False
+        return runs > 1
+
+    def _areas(self, fields: List[Tuple[int, int]], limit: int) -> Dict[Tuple[int, int], int]:
+        """
+        Flood fills from the fields; a flood fill stops after limit fields, and fields reached by an earlier flood fill
+        share its area.
+
+        :return: number of fields reachable from each field, at most limit
+        """
+        free, offsets = self.free, self.offsets
+        indices = {self._index(field): field for field in fields}
+        areas = {}
+        for start, field in indices.items():
+            if field in areas:
+                continue
+            visited = {start}
+            queue = deque([start])
+            while queue and len(visited) < limit:
+                node = queue.popleft()
+                for offset in offsets:
+                    neighbour = node + offset
+                    if free[neighbour] and neighbour not in visited:
+                        visited.add(neighbour)
+                        queue.append(neighbour)
+            for index in visited & indices.keys():
+                areas[indices[index]] = min(len(visited), limit)
+        return areas
+
+    def _is_free(self, field: Tuple[int, int]) -> bool:
+        return bool(self.free[self._index(field)])
+
+    def _cycle_distance(self, start: Tuple[int, int], end: Tuple[int, int]) -> int:
+        """
+        :return: number of steps from start to end along the cycle
+        """
+        return int(self.cycle[end] - self.cycle[start]) % self.n_fields
+
+    def _is_shortcut(self, head: Tuple[int, int], field: Tuple[int, int]) -> bool:
+        """
+        :return: True if moving from head to field keeps the body in the order of the cycle and does not pass the
+            food, so that each move brings the snake closer to the food along the cycle
+        """
+        distance = self._cycle_distance(head, field)
+        if distance == 1:
+            return True
+        return distance < self._tail_distance(head) and distance <= self._cycle_distance(head, self.food)
+
+    def _tail_distance(self, head: Tuple[int, int]) -> int:
+        """
+        :return: number of steps along the cycle from the head to the tail; all fields in between are free. A snake of
+            length one treats the field it left as tail, because it must not reverse; in the first tick, the head
+            becomes that field.
+        """
+        if len(self.body) > 1:
+            return self._cycle_distance(head, self.body[0])
+        if self.vacated is not None:
+            return self._cycle_distance(head, self.vacated)
+        return self.n_fields - 1
+
+    def _shortcut(self, head: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        :return: neighbour that is the farthest along the cycle without passing the tail or the food; at least the
+            next field of the cycle, which is always safe (the tail leaves it in time)
+        """
+        tail_distance = self._tail_distance(head)
+        food_distance = self._cycle_distance(head, self.food)
+        best, best_distance = None, 0
+        for field in self._neighbours(head):
+            distance = self._cycle_distance(head, field)
+            if distance == 1 and best_distance == 0:
+                best = field
+            elif best_distance < distance < tail_distance and distance <= food_distance and self._is_free(field):
+                best, best_distance = field, distance
+        return best
@@ -1,11 +1,17 @@
-from typing import Tuple, List, Optional
+from collections import Counter, deque
+from typing import Tuple, List, Optional, Union
+
+from actions import NONE, DIRECTION_TUPLES, REVERSAL_TUPLE, to_action
 
 
 class Snake:
     """
     Models the snake in the game.
+    The body is stored as deque together with a count of occupied fields, so that propagation, growth and the check
+    for self collision run in constant time independent of the snake's length.
 
     :ivar body: coordinates of the snakes body in reverse order (i.e. body[0] is tail, body[-1] is head)
+    :ivar action: encoded moving direction (see actions)
     :ivar moving_direction: (x, y) coordinates of snake's moving direction
     """
 
@@ -15,7 +21,26 @@ class Snake:
         :param body: List of (x, y) coordinates of snake's initial body
         """
         self.body = body
-        self.moving_direction = (0, 0)
+        self.action = NONE
+
+    @property
+    def body(self) -> List[Tuple[int, int]]:
+        """
+        :return: copy of the snake's body (i.e. body[0] is tail, body[-1] is head)
+        """
+        return list(self._body)
+
+    @body.setter
+    def body(self, body: List[Tuple[int, int]]) -> None:
+        self._body = deque(body)
+        self._occupied = Counter(self._body)
+
+    @property
+    def moving_direction(self) -> Tuple[int, int]:
+        return DIRECTION_TUPLES[self.action]
+
+    def __len__(self) -> int:
+        return len(self._body)
 
     def update(self, got_food: Optional[bool] = False) -> bool:
         """
@@ -26,26 +51,49 @@ class Snake:
 
         :return: True if propagation was successful, False if snake crashed into it's own body.
         """
-        # add propagated head
         new_head = self.get_propagated_head()
-        self.body = self.body + [new_head]
 
         # if snake did not eat, remove tail
         if not got_food:
-            del self.body[0]
+            tail = self._body.popleft()
+            self._occupied[tail] -= 1
+            if not self._occupied[tail]:
+                del self._occupied[tail]
 
-        # return whether snake crashed into itself
-        crashed = new_head in self.body[:-1]
+        # check whether snake crashes into itself and add propagated head
+        crashed = new_head in self._occupied
+        self._body.append(new_head)
+        self._occupied[new_head] += 1
         return not crashed
 
+    def occupies(self, field: Tuple[int, int]) -> bool:
+        """
+        :param field: (x, y) coordinate to check
+        :return: True if the field is covered by the snake's body
+        """
+        return field in self._occupied
+
+    def get_head(self) -> Tuple[int, int]:
+        """
+        :return: (x, y) of the snake's head
+        """
+        return self._body[-1]
+
+    def get_tail(self) -> Tuple[int, int]:
+        """
+        :return: (x, y) of the snake's tail
+        """
+        return self._body[0]
+
     def get_propagated_head(self) -> Tuple[int, int]:
         """
         Returns the position of the snake's had after propagation.
 
         :return: (x, y) of propagated head
         """
-        head = self.body[-1]
-        return head[0] + self.moving_direction[0], head[1] + self.moving_direction[1]
+        head = self._body[-1]
+        offset = DIRECTION_TUPLES[self.action]
+        return head[0] + offset[0], head[1] + offset[1]
 
     def get_moving_direction(self) -> Tuple[int, int]:
         """
@@ -53,12 +101,13 @@ class Snake:
         """
         return self.moving_direction
 
-    def change_moving_direction(self, new_direction: Tuple[int, int]) -> None:
+    def change_moving_direction(self, new_direction: Union[int, Tuple[int, int]]) -> None:
         """
         Updates self.moving_direction with a new direction.
 
-        :param new_direction: (x, y) of new direction
+        :param new_direction: action or (x, y) of new direction
         """
+        action = to_action(new_direction)
         # do not update, if direction should be reversed
-        if not (new_direction[0] == -self.moving_direction[0] and new_direction[1] == -self.moving_direction[1]):
-            self.moving_direction = new_direction
+        if action != REVERSAL_TUPLE[self.action]:
+            self.action = action
@@ -0,0 +1,63 @@
+from typing import Tuple, Optional
+
+import numpy as np
+
+from actions import DIRECTIONS, N_ACTIONS
+from interaction_handler import BoardEncodingDict
+
+# offsets of the neighbouring fields in the order of the features and actions: up, left, down, right
+NEIGHBOUR_OFFSETS = DIRECTIONS[:N_ACTIONS]
+N_FEATURES = 12
+
+
+def state_features(matrix: np.ndarray, head: Tuple[int, int], food: Tuple[int, int],
+                   moving_direction: Tuple[int, int], encoding: BoardEncodingDict,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Computes the 12 state features of one board from the known positions of head and food:
+    blocked neighbours (up, left, down, right), moving direction (up, left, down, right) and
+    direction of the food (above, left, below, right).
+
+    :param matrix: occupying matrix of the board
+    :param head: (x, y) of the snake's head
+    :param food: (x, y) of the food
+    :param moving_direction: (x, y) current moving direction of the snake
+    :param encoding: encoding of the board elements
+    :param out: optional array of length 12 the features are written into
+    :return: features as 0/1 values
+    """
+    if out is None:
+        out = np.empty(N_FEATURES, dtype=np.uint8)
+    neighbours = matrix[head[0] + NEIGHBOUR_OFFSETS[:, 0], head[1] + NEIGHBOUR_OFFSETS[:, 1]]
+    out[0:4] = (neighbours != encoding['valid']) & (neighbours != encoding['food'])
+    out[4:8] = (NEIGHBOUR_OFFSETS[:, 0] == moving_direction[0]) & (NEIGHBOUR_OFFSETS[:, 1] == moving_direction[1])
+    out[8] = food[0] < head[0]
+    out[9] = food[1] < head[1]
+    out[10] = food[0] > head[0]
+    out[11] = food[1] > head[1]
+    return out
+
+
+def batch_state_features(matrices: np.ndarray, heads: np.ndarray, foods: np.ndarray, moving_directions: np.ndarray,
+                         encoding: BoardEncodingDict, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Computes the state features of a batch of boards with one array operation per feature group.
+
+    :param matrices: (n, rows, cols) occupying matrices
+    :param heads: (n, 2) positions of the heads
+    :param foods: (n, 2) positions of the food
+    :param moving_directions: (n, 2) moving directions of the snakes
+    :param encoding: encoding of the board elements
+    :param out: optional (n, 12) array the features are written into
+    :return: (n, 12) features as 0/1 values
+    """
+    n = len(heads)
+    if out is None:
+        out = np.empty((n, N_FEATURES), dtype=np.uint8)
+    neighbours = heads[:, None, :] + NEIGHBOUR_OFFSETS[None, :, :]
+    values = matrices[np.arange(n)[:, None], neighbours[:, :, 0], neighbours[:, :, 1]]
+    out[:, 0:4] = (values != encoding['valid']) & (values != encoding['food'])
+    out[:, 4:8] = np.all(moving_directions[:, None, :] == NEIGHBOUR_OFFSETS[None, :, :], axis=2)
+    out[:, 8:10] = foods < heads
+    out[:, 10:12] = foods > heads
+    return out